@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import time
+
+# Cold start of one-shot phrasecraft commands: each run is a fresh process,
+# so interpreter start, imports and loading the engine the command needs are
+# all included. Also checks that none of them imports Qt.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 3
+COMMANDS = [
+    ['check', 'Ther is no plase like hom', '--lang', 'en'],
+    ['check', 'Ther is no plase like hom'],
+    ['synonyms', 'happy'],
+    ['define', 'serendipity'],
+    ['phonetics', 'hello world'],
+]
+
+PROBE = """
+import sys
+sys.argv = ['phrasecraft'] + {args!r}
+import phrasecraft
+phrasecraft.main()
+print('PyQt6' in sys.modules)
+"""
+
+
+def best_time(code):
+    best = float('inf')
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        best = min(best, elapsed)
+    return best, result.stdout
+
+
+def main():
+    baseline, _ = best_time('pass')
+    print(f"{'python -c pass':<40}{baseline * 1000:>8.0f} ms")
+    for args in COMMANDS:
+        label = ' '.join(args[:1] + [repr(a) if ' ' in a else a for a in args[1:]])
+        try:
+            elapsed, output = best_time(PROBE.format(args=args))
+        except RuntimeError as e:
+            print(f"{label:<40}  failed: {e}")
+            continue
+        note = '  (imported PyQt6!)' if output.strip().endswith('True') else ''
+        print(f"{label:<40}{elapsed * 1000:>8.0f} ms{note}")
+
+
+if __name__ == '__main__':
+    main()
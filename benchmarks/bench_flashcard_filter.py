@@ -0,0 +1,115 @@
+import os
+import random
+import sys
+import tempfile
+import time
+from itertools import accumulate
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QCoreApplication
+
+import flashcards
+import symspell
+from flashcard_model import FlashcardListModel, search_key
+
+# Filtering a 100k-card deck as the user types, searching meanings and
+# examples (about 100 characters each, drawn from English word frequencies).
+# For each keystroke: how long set_filter() blocks, the longest single pass of
+# the search between events, and how long until every match is listed.
+
+CARDS = 100_000
+BUDGET_MS = 10.0
+TYPED = ['w', 'wo', 'wor', 'word', 'x', 'xy', 't', 'th', 'the', 'e', 'e w']
+
+
+def english_words():
+    words, counts = [], []
+    with open(symspell.english_dictionary_path(), encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 2 and not line.startswith(';'):
+                words.append(parts[0])
+                counts.append(int(parts[1]))
+    return words, list(accumulate(counts))
+
+
+def make_deck(path):
+    rng = random.Random(0)
+    words, weights = english_words()
+
+    def sentence(length):
+        text = ''
+        while len(text) < length:
+            text += ' '.join(rng.choices(words, cum_weights=weights, k=4)) + ' '
+        return text.strip().capitalize() + '.'
+
+    manager = flashcards.FlashcardManager(path, json_path=path + '.json')
+    now = time.time()
+    rows = [(f"{rng.choice(words)}{i}", sentence(100), '', sentence(100), 0, 0, now, 2.5, 0.0, 0)
+            for i in range(CARDS)]
+    with manager.db:
+        manager.db.executemany('INSERT ' + flashcards.INSERT, rows)
+    manager.close()
+
+
+def run_events(app, until):
+    # Longest pass through the event loop, and total time, until until() holds
+    longest = 0.0
+    start = time.perf_counter()
+    while not until():
+        pass_start = time.perf_counter()
+        app.processEvents()
+        longest = max(longest, time.perf_counter() - pass_start)
+    return longest, time.perf_counter() - start
+
+
+def main():
+    app = QCoreApplication([])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'flashcards.db')
+        make_deck(path)
+        manager = flashcards.FlashcardManager(path, json_path=path + '.json')
+        model = FlashcardListModel(manager)
+        texts = {search_key(word): f"{word}\n{meaning}\n{example}".lower()
+                 for word, meaning, _, example in manager.all_details()}
+
+        # Switching the search on starts reading the texts on a worker thread
+        start = time.perf_counter()
+        model.set_filter('', True)
+        toggle = time.perf_counter() - start
+        longest_wait = 0.0
+        last = time.perf_counter()
+        while model.texts is None:
+            app.processEvents()
+            time.sleep(0.001)
+            now = time.perf_counter()
+            longest_wait = max(longest_wait, now - last - 0.001)
+            last = now
+        loaded = time.perf_counter() - start
+        print(f"{CARDS} cards, {sum(map(len, texts.values())) / CARDS:.0f} characters of text each")
+        print(f"switching text search on: {toggle * 1000:.1f} ms, texts ready after {loaded * 1000:.0f} ms "
+              f"(longest pause in between {longest_wait * 1000:.1f} ms)")
+
+        print(f"{'query':>6} {'matches':>8} {'set_filter':>11} {'longest pass':>13} {'all listed':>11}")
+        worst = 0.0
+        for query in TYPED:
+            start = time.perf_counter()
+            model.set_filter(query)
+            blocked = time.perf_counter() - start
+            longest, _ = run_events(app, lambda: not model.searching())
+            done = time.perf_counter() - start
+            expected = sorted(key for key, text in texts.items() if query in text)
+            assert model.visible == expected, query
+            worst = max(worst, blocked, longest)
+            print(f"{query!r:>6} {len(expected):8} {blocked * 1000:8.1f} ms {longest * 1000:10.1f} ms "
+                  f"{done * 1000:8.1f} ms")
+        manager.close()
+
+    print(f"longest the window waits on a keystroke: {worst * 1000:.1f} ms "
+          f"({'ok' if worst * 1000 <= BUDGET_MS else f'over the {BUDGET_MS:.0f} ms budget'})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import flashcards
+
+# Memory held by a loaded 100k-card deck: the per-card __dict__ objects
+# flashcards used to be loaded into, against the columnar Deck. Both sides
+# hold the same data: first word and review state only (the Deck as
+# loaded at startup, before any text is read), then every card's text too.
+
+CARDS = 100_000
+GOAL = 3.0
+
+
+class DictFlashcard:
+    # The previous layout: every field in a per-instance __dict__
+    def __init__(self, word, meaning=None, synonyms=None, example=None, reviewed_count=0, correct_count=0,
+                 due=0, ease=2.5, interval=0, repetitions=0):
+        self.word = word
+        self.meaning = meaning
+        self.synonyms = synonyms
+        self.example = example
+        self.reviewed_count = reviewed_count
+        self.correct_count = correct_count
+        self.due = due
+        self.ease = ease
+        self.interval = interval
+        self.repetitions = repetitions
+
+
+def sentence(rng, words):
+    return ' '.join(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 9)))
+                    for _ in range(words))
+
+
+def make_deck(path):
+    rng = random.Random(0)
+    manager = flashcards.FlashcardManager(path, json_path=path + '.json')
+    now = time.time()
+    rows = [(f"{sentence(rng, 1)}{i}", sentence(rng, 6), ', '.join(sentence(rng, 1) for _ in range(i % 4)),
+             sentence(rng, 10), i % 9, i % 5, now + i * 60, 2.5 - (i % 6) * 0.1, float(i % 30), i % 4)
+            for i in range(CARDS)]
+    with manager.db:
+        manager.db.executemany('INSERT ' + flashcards.INSERT, rows)
+    manager.close()
+
+
+def measure(load):
+    gc.collect()
+    tracemalloc.start()
+    deck = load()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return deck, size
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'flashcards.db')
+        make_deck(path)
+        db = flashcards.connect(path)
+
+        def load_dicts(with_text):
+            if with_text:
+                rows = db.execute(f"SELECT {', '.join(flashcards.COLUMNS)} FROM flashcards")
+                return {row[0]: DictFlashcard(*row) for row in rows}
+            rows = db.execute(f"SELECT word, {', '.join(flashcards.PROGRESS_COLUMNS)} FROM flashcards")
+            return {word: DictFlashcard(word, None, None, None, *progress) for word, *progress in rows}
+
+        def load_deck(with_text):
+            # With text, the text cache is made large enough to keep every card's
+            deck = flashcards.Deck(lambda word: db.execute(
+                'SELECT meaning, synonyms, example FROM flashcards WHERE word = ?', (word,)).fetchone(),
+                CARDS if with_text else flashcards.DETAILS_CACHE_SIZE)
+            if with_text:
+                for word, *row in db.execute(f"SELECT {', '.join(flashcards.COLUMNS)} FROM flashcards"):
+                    deck.add(word, row[3:], tuple(row[:3]))
+            else:
+                for word, *progress in db.execute(
+                        f"SELECT word, {', '.join(flashcards.PROGRESS_COLUMNS)} FROM flashcards"):
+                    deck.add(word, progress)
+            return deck
+
+        sample = random.Random(1).sample(range(CARDS), 1000)
+        results = []
+        for with_text in (False, True):
+            old, old_size = measure(lambda: load_dicts(with_text))
+            new, new_size = measure(lambda: load_deck(with_text))
+            # Same values come back out of the columnar deck
+            words = list(old)
+            for i in sample:
+                card, expected = new[words[i]], vars(old[words[i]])
+                if with_text:
+                    assert card.to_dict() == expected
+                else:
+                    assert card.progress() == tuple(expected[column] for column in flashcards.PROGRESS_COLUMNS)
+            results.append((old_size, new_size))
+            del old, new
+        db.close()
+
+    print(f"{CARDS} cards")
+    print(f"{'':21} {'__dict__ objects':>22} {'columnar Deck':>22} {'smaller':>8}")
+    for label, (old_size, new_size) in zip(('word and review state', 'all text loaded'), results):
+        print(f"{label:21} {old_size / 1e6:7.1f} MB ({old_size / CARDS:4.0f} B/card) "
+              f"{new_size / 1e6:7.1f} MB ({new_size / CARDS:4.0f} B/card) {old_size / new_size:7.1f}x")
+    ratio = results[0][0] / results[0][1]
+    print(f"columnar layout alone: {ratio:.1f}x smaller ({'ok' if ratio >= GOAL else f'below the {GOAL:.0f}x goal'})")
+
+
+if __name__ == '__main__':
+    main()
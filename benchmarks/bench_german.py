@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spellchecker import SpellChecker
+
+import wordtrie
+
+# Short typos, long compounds and words with no close match at all
+WORDS = ["Hauss", "schoen", "Mädchenn", "Fahrad", "Kindergartn",
+         "Strassenbahnhaltestelle", "Bundesverfassungsgerichtt", "Donaudampfschifffahrt"]
+
+
+def main():
+    checker = SpellChecker(language='de')
+    trie = wordtrie.WordTrie(checker.word_frequency.dictionary)
+
+    for word in WORDS:
+        trie.lookup(word)
+
+    print(f"{'word':<28}{'pyspellchecker':>16}{'WordTrie':>12}")
+    for word in WORDS:
+        start = time.perf_counter()
+        checker.candidates(word)
+        checker.correction(word)
+        pyspell_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        trie.lookup(word)
+        trie_time = time.perf_counter() - start
+
+        print(f"{word:<28}{pyspell_time * 1000:>14.1f}ms{trie_time * 1000:>10.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
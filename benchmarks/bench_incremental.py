@@ -0,0 +1,66 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spelling
+import symspell
+
+# Cost of one keystroke for the live checker on a 1,000-word line, against
+# checking the whole line again. Edits are random single-character inserts
+# and deletes plus the odd pasted word, from a fixed seed so runs compare.
+# Every result is also compared with a full correct_line().
+
+WORDS = ("the quick brown fox jumpd over lazy dog this sentense has sevral misteaks in it , . "
+         "recieve pakage tomorow morning definately best resturant in town").split()
+TEXT_WORDS = 1000
+EDITS = 300
+BUDGET_MS = 20
+
+
+def edit(text, rng):
+    pos = rng.randrange(len(text) + 1)
+    roll = rng.random()
+    if roll < 0.5:
+        return text[:pos] + rng.choice("abcdefghijklmnopqrstuvwxyz ,.") + text[pos:]
+    if roll < 0.8:
+        return text[:pos] + text[pos + 1:]
+    return text[:pos] + rng.choice(WORDS) + ' ' + text[pos:]
+
+
+def main():
+    rng = random.Random(0)
+    text = ' '.join(rng.choice(WORDS) for _ in range(TEXT_WORDS))
+    symspell.english()
+
+    start = time.perf_counter()
+    spelling.correct_line(text, 'en')
+    full = time.perf_counter() - start
+
+    checker = spelling.IncrementalChecker('en')
+    checker.update(text)
+    times = []
+    checked = 0
+    mismatches = 0
+    for _ in range(EDITS):
+        text = edit(text, rng)
+        start = time.perf_counter()
+        result = checker.update(text)
+        times.append(time.perf_counter() - start)
+        checked += checker.checked
+        mismatches += result[1:] != spelling.correct_line(text, 'en')
+
+    times.sort()
+    p50 = times[len(times) // 2] * 1000
+    p99 = times[int(len(times) * 0.99)] * 1000
+    verdict = 'ok' if p99 <= BUDGET_MS else 'OVER BUDGET'
+    print(f"Full check of {TEXT_WORDS} words: {full * 1000:.1f} ms")
+    print(f"Per keystroke: p50 {p50:.2f} ms, p99 {p99:.2f} ms ({verdict}, budget {BUDGET_MS} ms), "
+          f"{checked / EDITS:.1f} tokens checked on average")
+    print(f"Different from a full check: {mismatches}/{EDITS} edits")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ngramlang
+import spelling
+
+SAMPLES = {
+    'en': ["I havv a speling problm", "Where is the train station", "Please send me the documents before Friday"],
+    'de': ["Ich habe ein Problem mit der Rechtschreibung", "Wo ist der Bahnhof", "Das Mädchen spielt im Garten"],
+    'fr': ["Je voudrais un café s'il vous plaît", "Où est la gare"],
+    'es': ["Dónde está la estación de tren", "Me gusta mucho la comida"],
+    'it': ["Dove si trova la stazione", "Mi piace molto la pizza"],
+    'pt': ["Onde fica a estação de comboios", "Eu gosto muito de comer"],
+    'nl': ["Waar is het treinstation", "Ik hou van fietsen in de zomer"],
+}
+# Single words and typos, the main input of the windows, checked the way
+# they are: only correctable languages, short or unclear input going to 'en'
+WORD_SAMPLES = {
+    'en': ["teh", "helo", "recieve", "computer", "banana", "speling", "definately", "house",
+           "beautifull", "tomorow", "the quik fox", "Ther is no plase"],
+    'de': ["schnell", "Mädchen", "Straße", "gemacht", "Rechtschreibung", "Fahrrad",
+           "Ich habe einen Fehlr", "Wo ist der Bahnhof"],
+}
+ROUNDS = 200
+
+
+def main():
+    start = time.perf_counter()
+    ngramlang.load_profiles()
+    print(f"Profile load: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    texts = [(lang, text) for lang, group in SAMPLES.items() for text in group]
+    correct = sum(ngramlang.detect(text) == lang for lang, text in texts)
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for _, text in texts:
+            ngramlang.detect(text)
+    per_call = (time.perf_counter() - start) / (ROUNDS * len(texts))
+
+    words = [(lang, text) for lang, group in WORD_SAMPLES.items() for text in group]
+    wrong = [(text, spelling.detect_language(text)) for lang, text in words
+             if spelling.detect_language(text) != lang]
+
+    print(f"Accuracy: {correct}/{len(texts)} sentences")
+    print(f"Words and typos (spelling.detect_language): {len(words) - len(wrong)}/{len(words)}"
+          + (f", wrong: {wrong}" if wrong else ""))
+    print(f"detect(): {per_call * 1000:.3f} ms per call")
+
+
+if __name__ == '__main__':
+    main()
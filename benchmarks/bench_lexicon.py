@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+# Cold lookup time and peak memory for the first word lookup, going through
+# nltk's WordNet reader and through the precompiled index (lexicon.py). Each
+# run is a fresh process so loading costs are included.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORDS = ['running', 'cats', 'serendipity', 'geese', 'happier']
+
+PROBE = """
+import resource
+import time
+start = time.perf_counter()
+if {nltk!r}:
+    from nltk.corpus import wordnet
+    meanings = [[s.definition() for s in wordnet.synsets(word)] for word in {words!r}]
+else:
+    import lexicon
+    index = lexicon.load()
+    meanings = [index.lookup(word).definitions for word in {words!r}]
+print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, sum(map(len, meanings)))
+"""
+
+
+def run(nltk):
+    result = subprocess.run([sys.executable, '-c', PROBE.format(nltk=nltk, words=WORDS)],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    elapsed, rss_kb, senses = result.stdout.split()
+    return float(elapsed), int(rss_kb) / 1024, int(senses)
+
+
+def main():
+    # Compile the index first so its one-time build isn't counted
+    run(nltk=False)
+    for name, nltk in (('nltk', True), ('index', False)):
+        elapsed, rss_mb, senses = run(nltk)
+        print(f"{name:<6}{elapsed * 1000:>8.1f} ms  {rss_mb:>6.0f} MB peak  ({senses} senses for {len(WORDS)} words)")
+
+
+if __name__ == '__main__':
+    main()
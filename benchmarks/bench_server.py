@@ -0,0 +1,125 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+# Load test for phrasecraft_server.py on localhost. Starts the server (once
+# with micro-batching switched off, once with the defaults), keeps CLIENTS
+# keep-alive connections busy with a fixed mix of requests, and reports the
+# client-side QPS and p50/p99 latency next to the server's own /stats.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLIENTS = 32
+REQUESTS_PER_CLIENT = 100
+STARTUP_TIMEOUT_S = 120
+
+SENTENCES = [
+    "I havv a speling problm with thes sentense.",
+    "Ther is no plase like hom",
+    "Recieve the pakage tomorow morning",
+    "Ich habe einen Fehlr gemacht",
+]
+WORDS = ['happy', 'serendipity', 'run', 'light', 'bank', 'quick', 'house', 'dog']
+
+
+def request_mix(client):
+    # Same sequence every run; different clients start at different points
+    for i in range(REQUESTS_PER_CLIENT):
+        n = client * 7 + i
+        if n % 2 == 0:
+            body = json.dumps({'text': SENTENCES[n % len(SENTENCES)]}).encode()
+            yield (b"POST /check HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                   b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+        else:
+            path = '/synonyms' if n % 4 == 1 else '/define'
+            yield f"GET {path}?word={WORDS[n % len(WORDS)]} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode()
+
+
+async def read_response(reader):
+    headers = {}
+    status = int((await reader.readline()).split()[1])
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers['content-length']))
+    return status, body
+
+
+async def client(port, number, latencies):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for request in request_mix(number):
+        start = time.perf_counter()
+        writer.write(request)
+        status, _ = await read_response(reader)
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}")
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def load(port):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, number, latencies) for number in range(CLIENTS)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b"GET /stats HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+    _, body = await read_response(reader)
+    writer.close()
+    return elapsed, sorted(latencies), json.loads(body)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for(port, process):
+    deadline = time.time() + STARTUP_TIMEOUT_S
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def run(label, extra_args):
+    port = free_port()
+    process = subprocess.Popen([sys.executable, 'phrasecraft_server.py', '--port', str(port)] + extra_args,
+                               cwd=ROOT, stderr=subprocess.DEVNULL)
+    try:
+        wait_for(port, process)
+        elapsed, latencies, stats = asyncio.run(load(port))
+    finally:
+        process.terminate()
+        process.wait()
+
+    total = len(latencies)
+    p50 = latencies[total // 2] * 1000
+    p99 = latencies[min(total - 1, int(total * 0.99))] * 1000
+    print(f"{label}: {total} requests from {CLIENTS} clients in {elapsed:.2f}s "
+          f"({total / elapsed:.0f} QPS), p50 {p50:.1f} ms, p99 {p99:.1f} ms")
+    for path, endpoint in stats['endpoints'].items():
+        print(f"  {path:<10} server p50 {endpoint['p50_ms']} ms, p99 {endpoint['p99_ms']} ms, "
+              f"{endpoint['batches']} batches (mean {endpoint['mean_batch']} requests)")
+
+
+def main():
+    run("No batching", ['--batch-size', '1'])
+    run("Micro-batched", [])
+
+
+if __name__ == '__main__':
+    main()
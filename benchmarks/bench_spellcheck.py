@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from textblob import TextBlob
+
+import symspell
+
+# Fixed corpus so runs are comparable between machines and commits
+CORPUS = [
+    "I havv a speling problm with thes sentense.",
+    "Ther is no plase like hom",
+    "The quik brown fox jumpd ovr the lazi dog",
+    "Recieve the pakage tomorow morning",
+    "Speling korrectly is verry importnt for evrybody",
+    "Hello Wrld, this is a tst of the korrection engine",
+    "She sells sea shels by the sea shore",
+    "Whta a beautifull day it is todday",
+    "Definately the best resturant in town",
+    "Plese send me the documnts befor Friday",
+]
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    start = time.perf_counter()
+    symspell.english()
+    print(f"Index {symspell.english_origin}: {time.perf_counter() - start:.2f}s "
+          f"({len(symspell.english())} words, {len(symspell.english().deletes)} deletes)")
+
+    textblob_time = best_of(lambda: [str(TextBlob(s).correct()) for s in CORPUS], 3)
+    symspell_time = best_of(lambda: [symspell.correct(s) for s in CORPUS], 20)
+    agree = sum(str(TextBlob(s).correct()) == symspell.correct(s) for s in CORPUS)
+
+    print(f"TextBlob.correct(): {textblob_time * 1000:.1f} ms")
+    print(f"symspell.correct(): {symspell_time * 1000:.1f} ms")
+    print(f"Speedup: {textblob_time / symspell_time:.0f}x")
+    print(f"Identical output: {agree}/{len(CORPUS)} sentences")
+
+
+if __name__ == '__main__':
+    main()
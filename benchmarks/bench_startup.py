@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+
+# Time from interpreter start to the first painted window, for a bare PyQt6
+# window and for each PhraseCraft window. Each run is a fresh process so
+# import costs are included.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WINDOWS = ['ui', 'ui2', 'ui3', 'ui4', 'miniproj7']
+RUNS = 3
+# Allowed time on top of the bare PyQt6 window
+BUDGET_S = 0.3
+
+PROBE = """
+import time
+start = time.perf_counter()
+import sys
+from PyQt6.QtWidgets import QApplication, QWidget
+from PyQt6.QtCore import QTimer
+module = {module!r}
+if module:
+    window_class = __import__(module).PhraseCraftApp
+else:
+    window_class = QWidget
+app = QApplication(sys.argv)
+window = window_class()
+window.show()
+def painted():
+    print(time.perf_counter() - start)
+    app.quit()
+QTimer.singleShot(0, painted)
+app.exec()
+"""
+
+
+def time_to_window(module):
+    best = float('inf')
+    for _ in range(RUNS):
+        result = subprocess.run([sys.executable, '-c', PROBE.format(module=module)],
+                                cwd=ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        best = min(best, float(result.stdout.strip().splitlines()[-1]))
+    return best
+
+
+def main():
+    baseline = time_to_window('')
+    print(f"{'PyQt6 only':<12}{baseline * 1000:>8.0f} ms")
+    for module in WINDOWS:
+        try:
+            elapsed = time_to_window(module)
+        except RuntimeError as e:
+            print(f"{module:<12}  failed: {e}")
+            continue
+        verdict = 'ok' if elapsed - baseline <= BUDGET_S else 'OVER BUDGET'
+        print(f"{module:<12}{elapsed * 1000:>8.0f} ms  (+{(elapsed - baseline) * 1000:.0f} ms, {verdict})")
+
+
+if __name__ == '__main__':
+    main()
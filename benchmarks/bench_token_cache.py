@@ -0,0 +1,58 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spelling
+import symspell
+
+# Spellchecking a stream of sentences that keep repeating the same typos, as
+# the history of a real session does, with and without the token cache.
+# Reports the time per sentence, the cache hit rate and its memory use.
+
+SENTENCES = [
+    "I havv a speling problm with thes sentense.",
+    "Ther is no plase like hom",
+    "The quik brown fox jumpd ovr the lazi dog",
+    "Recieve the pakage tomorow morning",
+    "Speling korrectly is verry importnt for evrybody",
+    "Whta a beautifull day it is todday",
+    "Definately the best resturant in town",
+    "Plese send me the documnts befor Friday",
+]
+CHECKS = 2000
+
+
+def run(sentences):
+    start = time.perf_counter()
+    results = [spelling.correct_line(sentence, 'en') for sentence in sentences]
+    return time.perf_counter() - start, results
+
+
+def main():
+    rng = random.Random(0)
+    sentences = [rng.choice(SENTENCES) for _ in range(CHECKS)]
+    symspell.english()
+
+    # A cache that can hold nothing behaves like no cache at all
+    spelling.token_cache.resize(0)
+    uncached, expected = run(sentences)
+
+    spelling.token_cache.resize(spelling.TOKEN_CACHE_SIZE)
+    before = spelling.token_cache.stats()
+    cached, results = run(sentences)
+    stats = spelling.token_cache_stats()
+    hits = stats['hits'] - before['hits']
+    lookups = hits + stats['misses'] - before['misses']
+
+    print(f"No cache:   {uncached / CHECKS * 1000:.3f} ms per sentence")
+    print(f"With cache: {cached / CHECKS * 1000:.3f} ms per sentence ({uncached / cached:.0f}x)")
+    print(f"Hit rate {hits / lookups:.1%} over {lookups} tokens, "
+          f"{stats['size']} entries in {stats['bytes'] / 1024:.0f} KB")
+    print(f"Same results: {results == expected}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+import gc
+import threading
+import time
+
+import lexicon as lexicon_index
+import wordtrie
+from lrucache import LRUCache
+
+WARM_UP_DELAY_MS = 300
+# How long typing has to pause before the windows check the text as it stands
+LIVE_CHECK_DELAY_MS = 150
+# Words whose meanings/synonyms stay cached; resize with word_info_cache.resize()
+WORD_INFO_CACHE_SIZE = 1024
+
+# Heavy engines, created on first use instead of at import time.
+# Importing g2p_en, opening (or first compiling) the WordNet index, loading
+# the German dictionary and building the spelling indexes all take far longer
+# than creating the window, so none of it happens before the window is shown.
+# warm_up() can load them on a background thread once the window is up, so
+# the first click doesn't pay for it either.
+
+
+class Lazy:
+    # Calls factory once, on first use, from whichever thread gets there first
+    def __init__(self, factory):
+        self.factory = factory
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.value = None
+        self.load_time = None
+
+    def __call__(self):
+        if not self.loaded:
+            with self.lock:
+                if not self.loaded:
+                    start = time.perf_counter()
+                    self.value = self.factory()
+                    self.load_time = time.perf_counter() - start
+                    self.loaded = True
+        return self.value
+
+
+def _load_cmudict():
+    from nltk.corpus import cmudict
+    return cmudict.dict()
+
+
+def _load_g2p():
+    from g2p_en import G2p
+    return G2p()
+
+
+def _load_german_spell_checker():
+    from spellchecker import SpellChecker
+    return SpellChecker(language='de')
+
+
+lexicon = Lazy(lexicon_index.load)
+cmudict = Lazy(_load_cmudict)
+g2p = Lazy(_load_g2p)
+german_spell_checker = Lazy(_load_german_spell_checker)
+german_candidates = Lazy(lambda: wordtrie.WordTrie(german_spell_checker().word_frequency.dictionary))
+
+word_info_cache = LRUCache(WORD_INFO_CACHE_SIZE)
+
+
+def word_info(word):
+    # Definitions, synonyms and examples for word, looked up once and shared by
+    # the meaning, origin and synonym handlers
+    return word_info_cache.get_or_compute(word.lower(), lambda key: lexicon().lookup(key))
+
+
+def warm_up(*engines):
+    # Load the given engines one after another on a daemon thread.
+    # They stay loaded for the life of the process, and a full garbage
+    # collection over them (the English index alone is a few hundred thousand
+    # lists) holds the GIL for ~80 ms, stalling the GUI thread. So collection
+    # is paused while they load, then one last collection clears any garbage
+    # and gc.freeze() moves what is left out of the collector's reach.
+    def run():
+        gc.disable()
+        try:
+            for engine in engines:
+                try:
+                    engine()
+                except Exception:
+                    # Not fatal here; the handler that needs it will report the error
+                    pass
+        finally:
+            gc.collect()
+            gc.freeze()
+            gc.enable()
+
+    thread = threading.Thread(target=run, name='warm-up', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,256 @@
+import bisect
+from itertools import compress, repeat
+from operator import contains
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer
+
+import flashcards
+from workers import LatestJobRunner
+
+# Qt list model over a FlashcardManager's cards.
+# The view asks for rows as it paints them, so only the visible words are
+# ever turned into display data, however large the deck is. The model keeps
+# just a sorted list of search keys (lowercased word, NUL, word); adding or
+# removing a card inserts or removes one row (found by binary search)
+# instead of rebuilding the list.
+#
+# The list can be filtered as the user types. Words starting with the query
+# are a contiguous slice of the sorted keys, found with two binary searches
+# and shown as a range without copying anything. Searching meanings and
+# examples too checks the query against each card's lowercased text. The
+# texts are read on a worker thread when that search is first switched on
+# (until they arrive only words are matched), and the cards are checked
+# SEARCH_BATCH at a time between events, matches being added to the list as
+# they are found, so a keystroke never waits for the whole deck. When the new
+# query extends the previous one only the previous matches, and any cards not
+# checked yet, are checked again. benchmarks/bench_flashcard_filter.py
+# measures it.
+
+LAST_CHAR = chr(0x10FFFF)
+# Cards checked against a text query per event loop pass
+SEARCH_BATCH = 2000
+
+
+def search_key(word):
+    return f"{word.lower()}\0{word}"
+
+
+def key_word(key):
+    return key.partition('\0')[2]
+
+
+def read_texts(manager):
+    # Runs on a worker thread, so it reads through a connection of its own
+    db = flashcards.connect(manager.db_path)
+    try:
+        return {search_key(word): f"{word}\n{meaning}\n{example}".lower()
+                for word, meaning, _, example in manager.all_details(db)}
+    finally:
+        db.close()
+
+
+class FlashcardListModel(QAbstractListModel):
+    def __init__(self, manager, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.keys = sorted(search_key(word) for word in manager.flashcards)
+        # Search key -> lowercased word, meaning and example; None until read
+        self.texts = None
+        self.texts_loading = False
+        self.text_loader = LatestJobRunner(self)
+        self.text_loader.finished.connect(self._texts_loaded)
+        self.text_loader.failed.connect(self._texts_failed)
+        # Words added or removed while the texts were being read
+        self.stale = set()
+        self.query = ''
+        self.search_text = False
+        # Rows on show: a range over keys for prefix searches, else a sorted
+        # list of the keys found so far
+        self.visible = range(len(self.keys))
+        # Keys still to be checked against a text query, from checked_to on
+        self.unchecked = []
+        self.checked_to = 0
+        self.search_timer = QTimer(self)
+        self.search_timer.timeout.connect(self._search_batch)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return self.word_at(index.row())
+
+    def _key_at(self, row):
+        if isinstance(self.visible, range):
+            return self.keys[self.visible[row]]
+        return self.visible[row]
+
+    def word_at(self, row):
+        return key_word(self._key_at(row))
+
+    def row_of(self, word):
+        key = search_key(word)
+        if isinstance(self.visible, range):
+            index = bisect.bisect_left(self.keys, key)
+            row = index - self.visible.start
+            if index < self.visible.stop and row >= 0 and self.keys[index] == key:
+                return row
+            return None
+        row = bisect.bisect_left(self.visible, key)
+        if row < len(self.visible) and self.visible[row] == key:
+            return row
+        return None
+
+    def searching(self):
+        # True while cards are still being checked against a text query
+        return self.checked_to < len(self.unchecked)
+
+    def _card_text(self, word):
+        card = self.manager.flashcards[word]
+        return f"{word}\n{card.meaning}\n{card.example}".lower()
+
+    def _prefix_range(self):
+        query = self.query.lower()
+        return range(bisect.bisect_left(self.keys, query), bisect.bisect_left(self.keys, query + LAST_CHAR))
+
+    def _load_texts(self):
+        # One query for the whole deck rather than loading each card's text
+        if self.texts is None and not self.texts_loading:
+            self.texts_loading = True
+            self.text_loader.submit(read_texts, self.manager)
+
+    def _texts_loaded(self, texts):
+        for word in self.stale:
+            if word in self.manager.flashcards:
+                texts[search_key(word)] = self._card_text(word)
+            else:
+                texts.pop(search_key(word), None)
+        self.texts, self.texts_loading, self.stale = texts, False, set()
+        if self.search_text and self.query:
+            self._refilter()
+
+    def _texts_failed(self, error):
+        # Words are still searched; switching the text search on again retries
+        self.texts_loading = False
+        self.stale = set()
+
+    def set_filter(self, query, search_text=None):
+        previous_query, previous_text = self.query.lower(), self.search_text
+        self.query = query
+        if search_text is not None:
+            self.search_text = search_text
+        if self.search_text:
+            self._load_texts()
+        narrowing = (previous_text and self.search_text and previous_query
+                     and not isinstance(self.visible, range) and query.lower().startswith(previous_query))
+        self._refilter(narrowing)
+
+    def _refilter(self, narrowing=False):
+        self.beginResetModel()
+        if self.search_text and self.query and self.texts is not None:
+            if narrowing:
+                # A card that didn't match the previous query can't match this one
+                unchecked = self.visible + self.unchecked[self.checked_to:]
+            else:
+                unchecked = self.keys
+            self.visible, self.unchecked, self.checked_to = [], unchecked, 0
+        else:
+            self.visible = self._prefix_range()
+            self.unchecked, self.checked_to = [], 0
+        self.endResetModel()
+        if self.unchecked:
+            # The first batch straight away, the rest between events
+            self._search_batch()
+        else:
+            self.search_timer.stop()
+
+    def _search_batch(self):
+        start = self.checked_to
+        batch = self.unchecked[start:start + SEARCH_BATCH]
+        self.checked_to = start + len(batch)
+        # Same as checking "query in text" for each card, without a Python-level loop
+        found = list(compress(batch, map(contains, map(self.texts.__getitem__, batch),
+                                         repeat(self.query.lower()))))
+        if found:
+            row = len(self.visible)
+            self.beginInsertRows(QModelIndex(), row, row + len(found) - 1)
+            self.visible.extend(found)
+            self.endInsertRows()
+        if self.searching():
+            if not self.search_timer.isActive():
+                self.search_timer.start()
+        else:
+            self.search_timer.stop()
+            self.unchecked, self.checked_to = [], 0
+
+    def _card_changed(self, word):
+        # Keeps the texts current; True if a search in progress had to start over
+        if self.texts is not None:
+            key = search_key(word)
+            if word in self.manager.flashcards:
+                self.texts[key] = self._card_text(word)
+            else:
+                self.texts.pop(key, None)
+        elif self.texts_loading:
+            self.stale.add(word)
+        if self.searching():
+            self._refilter()
+            return True
+        return False
+
+    def add_word(self, word):
+        key = search_key(word)
+        index = bisect.bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            # Same word again; only its text may have changed
+            self._card_changed(word)
+            return
+        self.keys.insert(index, key)
+        if self._card_changed(word):
+            return
+
+        if isinstance(self.visible, range):
+            # Indexes after the new key have moved; the range is recomputed either way
+            old = self.visible
+            new = self._prefix_range()
+            if len(new) > len(old):
+                row = index - new.start
+                self.beginInsertRows(QModelIndex(), row, row)
+                self.visible = new
+                self.endInsertRows()
+            else:
+                self.visible = new
+        elif self.query.lower() in self.texts[key]:
+            row = bisect.bisect_left(self.visible, key)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.visible.insert(row, key)
+            self.endInsertRows()
+
+    def remove_word(self, word):
+        key = search_key(word)
+        index = bisect.bisect_left(self.keys, key)
+        if index == len(self.keys) or self.keys[index] != key:
+            return
+        if self.searching():
+            del self.keys[index]
+            self._card_changed(word)
+            return
+        row = self.row_of(word)
+        if row is not None:
+            self.beginRemoveRows(QModelIndex(), row, row)
+        del self.keys[index]
+        self._card_changed(word)
+        if isinstance(self.visible, range):
+            self.visible = self._prefix_range()
+        elif row is not None:
+            del self.visible[row]
+        if row is not None:
+            self.endRemoveRows()
+
+    def reload(self):
+        # Start over from the manager, e.g. after it reloaded its cards
+        self.keys = sorted(search_key(word) for word in self.manager.flashcards)
+        self.texts, self.texts_loading, self.stale = None, False, set()
+        self.text_loader.cancel()
+        self.set_filter(self.query)
@@ -0,0 +1,411 @@
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+
+import scheduler
+from lrucache import LRUCache
+
+# Flashcard storage.
+# Cards live in a SQLite database keyed by word, so adding, deleting or
+# answering a card writes that one row instead of rewriting the whole deck.
+# Decks saved by older versions as flashcards.json are imported the first
+# time the database is opened, and the JSON file is then renamed so the
+# import only happens once.
+#
+# Quiz answers are the most frequent write, so progress updates don't touch
+# the database on the GUI thread at all: ProgressWriter collects them and
+# writes them in one transaction every FLUSH_SIZE updates or FLUSH_INTERVAL_S
+# seconds, whichever comes first, and once more on close(). A crash loses
+# at most the updates of the current window; a transaction is applied
+# completely or not at all.
+#
+# The progress totals and the most-reviewed list are kept up to date as
+# cards change, so showing them doesn't walk the deck. Review counts only
+# grow, so the top list changes only when a card overtakes its last entry;
+# it is recomputed from all cards only when one of its cards is removed.
+
+DB_PATH = 'flashcards.db'
+JSON_PATH = 'flashcards.json'
+FLUSH_SIZE = 50
+FLUSH_INTERVAL_S = 2.0
+# Length of the most-reviewed list kept up to date for the progress tab
+TOP_K = 5
+# Cards whose text (meaning, synonyms, example) is kept in memory once read
+DETAILS_CACHE_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS flashcards (
+    word TEXT PRIMARY KEY,
+    meaning TEXT NOT NULL,
+    synonyms TEXT NOT NULL,
+    example TEXT NOT NULL,
+    reviewed_count INTEGER NOT NULL DEFAULT 0,
+    correct_count INTEGER NOT NULL DEFAULT 0,
+    due REAL NOT NULL DEFAULT 0,
+    ease REAL NOT NULL DEFAULT 2.5,
+    interval REAL NOT NULL DEFAULT 0,
+    repetitions INTEGER NOT NULL DEFAULT 0
+)
+"""
+# Columns added after the first SQLite version, with their definitions for older databases
+ADDED_COLUMNS = {
+    'due': 'REAL NOT NULL DEFAULT 0',
+    'ease': 'REAL NOT NULL DEFAULT 2.5',
+    'interval': 'REAL NOT NULL DEFAULT 0',
+    'repetitions': 'INTEGER NOT NULL DEFAULT 0',
+}
+# Everything a review changes, written by ProgressWriter
+PROGRESS_COLUMNS = ('reviewed_count', 'correct_count', 'due', 'ease', 'interval', 'repetitions')
+COLUMNS = ('word', 'meaning', 'synonyms', 'example') + PROGRESS_COLUMNS
+UPDATE_PROGRESS = f"UPDATE flashcards SET {', '.join(f'{column} = ?' for column in PROGRESS_COLUMNS)} WHERE word = ?"
+INSERT = f"INTO flashcards ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+# Review state is stored column by column in typed arrays
+TYPECODES = {'reviewed_count': 'I', 'correct_count': 'I', 'due': 'd',
+             'ease': 'd', 'interval': 'd', 'repetitions': 'I'}
+DEFAULTS = {'reviewed_count': 0, 'correct_count': 0, 'due': 0,
+            'ease': scheduler.INITIAL_EASE, 'interval': 0, 'repetitions': 0}
+
+
+def _column(name):
+    def get(card):
+        return card.deck.columns[name][card.row]
+
+    def set(card, value):
+        card.deck.columns[name][card.row] = value
+
+    return property(get, set)
+
+
+class Flashcard:
+    # A view of one card in a Deck; reading or setting an attribute reads
+    # or writes the deck's columns
+    __slots__ = ('deck', 'row')
+
+    reviewed_count = _column('reviewed_count')
+    correct_count = _column('correct_count')
+    due = _column('due')
+    ease = _column('ease')
+    interval = _column('interval')
+    repetitions = _column('repetitions')
+
+    def __init__(self, deck, row):
+        self.deck = deck
+        self.row = row
+
+    def __eq__(self, other):
+        return isinstance(other, Flashcard) and self.deck is other.deck and self.row == other.row
+
+    def __hash__(self):
+        return hash((id(self.deck), self.row))
+
+    @property
+    def word(self):
+        return self.deck.words[self.row]
+
+    @property
+    def meaning(self):
+        return self.deck.text(self.word)[0]
+
+    @property
+    def synonyms(self):
+        return self.deck.text(self.word)[1]
+
+    @property
+    def example(self):
+        return self.deck.text(self.word)[2]
+
+    def to_dict(self):
+        # Same fields (and JSON format) as the old vars(card)
+        return {column: getattr(self, column) for column in COLUMNS}
+
+    def to_row(self):
+        return tuple(getattr(self, column) for column in COLUMNS)
+
+    def progress(self):
+        return tuple(getattr(self, column) for column in PROGRESS_COLUMNS)
+
+
+class Deck:
+    # Columnar in-memory deck: one word string per card, review state in
+    # typed arrays indexed by row, and the text fields (meaning, synonyms,
+    # example) left in the database until a card is shown, the most recently
+    # shown DETAILS_CACHE_SIZE kept in memory. Deleted rows are reused by
+    # later cards. Behaves like a read-only word -> Flashcard dict.
+    def __init__(self, loader, details_size=DETAILS_CACHE_SIZE):
+        # loader(word) -> (meaning, synonyms, example) from the database
+        self.loader = loader
+        self.words = []
+        self.rows = {}
+        self.free = []
+        self.columns = {column: array(TYPECODES[column]) for column in PROGRESS_COLUMNS}
+        # word -> text, for cards whose text was read or written lately; the
+        # database always has the same text, so dropping an entry loses nothing
+        self.details = LRUCache(details_size)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __contains__(self, word):
+        return word in self.rows
+
+    def __getitem__(self, word):
+        return Flashcard(self, self.rows[word])
+
+    def get(self, word, default=None):
+        row = self.rows.get(word)
+        return default if row is None else Flashcard(self, row)
+
+    def values(self):
+        return (Flashcard(self, row) for row in self.rows.values())
+
+    def items(self):
+        return ((word, Flashcard(self, row)) for word, row in self.rows.items())
+
+    def add(self, word, progress, details=None):
+        row = self.rows.get(word)
+        if row is None:
+            if self.free:
+                row = self.free.pop()
+                self.words[row] = word
+            else:
+                row = len(self.words)
+                self.words.append(word)
+                for column in self.columns.values():
+                    column.append(0)
+            self.rows[word] = row
+        for column, value in zip(PROGRESS_COLUMNS, progress):
+            self.columns[column][row] = value
+        if details is not None:
+            self.details.put(word, details)
+        else:
+            self.details.pop(word, None)
+        return Flashcard(self, row)
+
+    def remove(self, word):
+        row = self.rows.pop(word)
+        self.words[row] = None
+        # Zeroed so column totals only count live cards
+        for column in self.columns.values():
+            column[row] = 0
+        self.free.append(row)
+        self.details.pop(word, None)
+
+    def text(self, word):
+        return self.details.get_or_compute(word, self._load)
+
+    def _load(self, word):
+        return tuple(self.loader(word))
+
+    def total(self, column):
+        return sum(self.columns[column])
+
+
+def connect(db_path):
+    db = sqlite3.connect(db_path, timeout=10)
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA synchronous=NORMAL')
+    return db
+
+
+class ProgressWriter(threading.Thread):
+    def __init__(self, db_path, flush_size=FLUSH_SIZE, flush_interval=FLUSH_INTERVAL_S):
+        super().__init__(name='flashcard-writer', daemon=True)
+        self.db_path = db_path
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        # word -> values for PROGRESS_COLUMNS; later updates replace earlier ones
+        self.pending = {}
+        # Held while a batch is written, so callers can order their own writes around it
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.closing = False
+
+    def update(self, word, progress):
+        with self.lock:
+            self.pending[word] = progress
+            if len(self.pending) >= self.flush_size:
+                self.wake.set()
+
+    def run(self):
+        db = connect(self.db_path)
+        try:
+            while not self.closing:
+                self.wake.wait(self.flush_interval)
+                self.wake.clear()
+                self.flush(db)
+            self.flush(db)
+        finally:
+            db.close()
+
+    def flush(self, db):
+        with self.lock:
+            if not self.pending:
+                return
+            batch = [progress + (word,) for word, progress in self.pending.items()]
+            self.pending = {}
+            with db:
+                db.executemany(UPDATE_PROGRESS, batch)
+
+    def close(self):
+        self.closing = True
+        self.wake.set()
+        self.join()
+
+
+class FlashcardManager:
+    def __init__(self, db_path=DB_PATH, json_path=JSON_PATH):
+        self.db_path = db_path
+        self.json_path = json_path
+        self.db = connect(db_path)
+        self.db.execute(SCHEMA)
+        self.upgrade_schema()
+        self.load_flashcards()
+        self.writer = ProgressWriter(db_path)
+        self.writer.start()
+
+    def add_flashcard(self, word, meaning, synonyms, example):
+        replaced = self.flashcards.get(word)
+        if replaced is not None:
+            self._forget(replaced)
+        # New cards are due straight away
+        progress = dict(DEFAULTS, due=time.time())
+        card = self.flashcards.add(word, [progress[column] for column in PROGRESS_COLUMNS],
+                                   (meaning, synonyms, example))
+        self.review_queue.push(card)
+        self._update_top(card)
+        # A buffered update for an earlier card with this word must not land on the new one
+        with self.writer.lock, self.db:
+            self.writer.pending.pop(word, None)
+            self.db.execute('INSERT OR REPLACE ' + INSERT, card.to_row())
+
+    def delete_flashcard(self, word):
+        if word in self.flashcards:
+            self._forget(self.flashcards[word])
+            self.flashcards.remove(word)
+            with self.writer.lock, self.db:
+                self.writer.pending.pop(word, None)
+                self.db.execute('DELETE FROM flashcards WHERE word = ?', (word,))
+
+    def get_flashcard(self, word):
+        return self.flashcards.get(word)
+
+    def get_all_flashcards(self):
+        return list(self.flashcards.values())
+
+    def next_due_flashcard(self):
+        # Most overdue card, or None when nothing is due
+        return self.review_queue.next_due()
+
+    def next_flashcard(self):
+        # Card due soonest, even if it isn't due yet
+        return self.review_queue.peek()
+
+    def update_flashcard_progress(self, word, is_correct, grade=None, schedule=True):
+        # grade is the SM-2 recall grade (0-5); by default a right answer
+        # counts as GRADE_CORRECT and a wrong one as GRADE_WRONG. Just looking
+        # at a card (schedule=False) updates the counters but not when it is due
+        if word in self.flashcards:
+            card = self.flashcards[word]
+            card.reviewed_count += 1
+            self.total_reviews += 1
+            if is_correct:
+                card.correct_count += 1
+                self.total_correct += 1
+            self._update_top(card)
+            if schedule:
+                if grade is None:
+                    grade = scheduler.GRADE_CORRECT if is_correct else scheduler.GRADE_WRONG
+                scheduler.review(card, grade)
+                self.review_queue.push(card)
+            self.writer.update(word, card.progress())
+
+    def most_reviewed(self):
+        # Up to TOP_K cards with the most reviews, most reviewed first
+        return list(self.top_reviewed)
+
+    def _rebuild_aggregates(self):
+        self.total_reviews = self.flashcards.total('reviewed_count')
+        self.total_correct = self.flashcards.total('correct_count')
+        self.top_reviewed = heapq.nlargest(TOP_K, self.flashcards.values(), key=lambda card: card.reviewed_count)
+
+    def _forget(self, card):
+        # Take a card that is going away out of the aggregates
+        self.total_reviews -= card.reviewed_count
+        self.total_correct -= card.correct_count
+        if card in self.top_reviewed:
+            # Whatever should replace it could be anywhere in the deck
+            self.top_reviewed = heapq.nlargest(TOP_K, (c for c in self.flashcards.values() if c != card),
+                                               key=lambda c: c.reviewed_count)
+
+    def _update_top(self, card):
+        # card's review count went up (or it is new); it may now belong in the top list
+        top = self.top_reviewed
+        if card not in top:
+            if len(top) == TOP_K and card.reviewed_count <= top[-1].reviewed_count:
+                return
+            top.append(card)
+        top.sort(key=lambda c: c.reviewed_count, reverse=True)
+        del top[TOP_K:]
+
+    def save_flashcards(self):
+        # Every change is already written as it happens; this rewrites all rows
+        # in one transaction, e.g. after editing cards in place
+        self._rebuild_aggregates()
+        cards = list(self.flashcards.values())
+        loaded = self.flashcards.details
+        with self.writer.lock, self.db:
+            self.writer.pending.clear()
+            # Text not held in memory is the database's own; only its progress is written
+            self.db.executemany(UPDATE_PROGRESS, [card.progress() + (card.word,) for card in cards
+                                                  if card.word not in loaded])
+            self.db.executemany('INSERT OR REPLACE ' + INSERT, [card.to_row() for card in cards
+                                                                if card.word in loaded])
+
+    def upgrade_schema(self):
+        existing = {row[1] for row in self.db.execute('PRAGMA table_info(flashcards)')}
+        with self.db:
+            for column, definition in ADDED_COLUMNS.items():
+                if column not in existing:
+                    self.db.execute(f'ALTER TABLE flashcards ADD COLUMN {column} {definition}')
+
+    def load_flashcards(self):
+        self.migrate_json()
+        self.flashcards = Deck(self.load_details)
+        for word, *progress in self.db.execute(f"SELECT word, {', '.join(PROGRESS_COLUMNS)} FROM flashcards"):
+            self.flashcards.add(word, progress)
+        self.review_queue = scheduler.ReviewQueue(self.flashcards)
+        self._rebuild_aggregates()
+
+    def load_details(self, word):
+        return self.db.execute('SELECT meaning, synonyms, example FROM flashcards WHERE word = ?', (word,)).fetchone()
+
+    def all_details(self, db=None):
+        # (word, meaning, synonyms, example) for every card, in one query; pass
+        # a connection of its own (see connect()) to read from another thread
+        return (db or self.db).execute('SELECT word, meaning, synonyms, example FROM flashcards')
+
+    def migrate_json(self):
+        # One-time import of a deck saved by the JSON-file version
+        if not os.path.exists(self.json_path):
+            return
+        with open(self.json_path, 'r') as f:
+            data = json.load(f)
+        with self.db:
+            self.db.executemany('INSERT OR IGNORE ' + INSERT,
+                                [tuple(card_data.get(column, DEFAULTS.get(column)) for column in COLUMNS)
+                                 for card_data in data.values()])
+        os.replace(self.json_path, self.json_path + '.migrated')
+
+    def close(self):
+        # Writes out buffered progress before closing
+        self.writer.close()
+        self.db.close()
@@ -0,0 +1,78 @@
+import itertools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Texts the user has spellchecked, most recent first, kept between sessions.
+# Only the last HISTORY_SIZE distinct texts are kept in memory; checking a
+# text again moves it to the front and counts the repeat instead of adding a
+# second entry. Every check is also appended to a log file, one JSON line
+# each, which is replayed on first use. When the log passes MAX_LOG_BYTES it
+# is renamed to <path>.1 (replacing the previous one) and a new log started,
+# so the files on disk stay bounded too.
+
+HISTORY_PATH = 'history.log'
+HISTORY_SIZE = 500
+MAX_LOG_BYTES = 256 * 1024
+PAGE_SIZE = 20
+
+
+class History:
+    def __init__(self, maxsize=HISTORY_SIZE, path=HISTORY_PATH, max_log_bytes=MAX_LOG_BYTES):
+        self.maxsize = maxsize
+        self.path = path
+        self.max_log_bytes = max_log_bytes
+        self.lock = threading.Lock()
+        # text -> times checked, least recent first; None until first used
+        self.entries = None
+
+    def _remember(self, text):
+        count = self.entries.pop(text, 0) + 1
+        self.entries[text] = count
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def _loaded(self):
+        # Called with the lock held; the rotated log is older, so it goes first
+        if self.entries is None:
+            self.entries = OrderedDict()
+            for path in (self.path + '.1', self.path):
+                if not os.path.exists(path):
+                    continue
+                with open(path, encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            self._remember(json.loads(line)['text'])
+                        except (ValueError, KeyError, TypeError):
+                            # Last line cut short by a crash mid-write
+                            continue
+        return self.entries
+
+    def add(self, text):
+        if not text.strip():
+            return
+        with self.lock:
+            self._loaded()
+            self._remember(text)
+            if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_log_bytes:
+                os.replace(self.path, self.path + '.1')
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'text': text, 'time': round(time.time())}, ensure_ascii=False) + '\n')
+
+    def __len__(self):
+        with self.lock:
+            return len(self._loaded())
+
+    def page(self, number, size=PAGE_SIZE):
+        # (text, times checked) pairs on page number (0 = most recent), and
+        # how many pages there are
+        with self.lock:
+            entries = self._loaded()
+            pages = (len(entries) + size - 1) // size
+            start = number * size
+            return list(itertools.islice(reversed(entries.items()), start, start + size)), pages
+
+
+history = History()
@@ -0,0 +1,229 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+# Precompiled WordNet lookups.
+# nltk parses the WordNet data files the first time wordnet.synsets() is
+# called, which takes several seconds and keeps the whole database in memory.
+# build() runs those lookups once and writes the answers (definitions, lemma
+# names and examples per synset, synset numbers per word) to a single file
+# that Lexicon memory-maps. A lookup is a binary search over the sorted words
+# plus decoding a few small records, and only the touched pages are read in.
+#
+#   python lexicon.py --build
+#
+# File layout, all integers little-endian uint32:
+#   header   magic, version, word count, synset count, then the byte offset
+#            of each of the four sections below
+#   words    word count + 1 offsets into the word text, then the text itself
+#   senses   word count + 1 offsets into the synset number list, then the list
+#   synsets  synset count + 1 offsets into the records, then the records, each
+#            one JSON array [pos, definition, lemma names, examples]
+
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wordnet.idx')
+
+MAGIC = b'WNLX'
+VERSION = 1
+HEADER = struct.Struct('<4sIII4I')
+
+# Regular inflections, as in nltk's morphy, for words that are not in the
+# index themselves ("cats" -> "cat")
+SUBSTITUTIONS = {
+    'n': [('s', ''), ('ses', 's'), ('ves', 'f'), ('xes', 'x'), ('zes', 'z'),
+          ('ches', 'ch'), ('shes', 'sh'), ('men', 'man'), ('ies', 'y')],
+    'v': [('s', ''), ('ies', 'y'), ('es', 'e'), ('es', ''), ('ed', 'e'),
+          ('ed', ''), ('ing', 'e'), ('ing', '')],
+    'a': [('er', ''), ('est', ''), ('er', 'e'), ('est', 'e')],
+    'r': [],
+}
+
+
+class Entry:
+    __slots__ = ('definitions', 'synonyms', 'examples')
+
+    def __init__(self, definitions, synonyms, examples):
+        self.definitions = definitions
+        self.synonyms = synonyms
+        self.examples = examples
+
+
+def _uint32(values):
+    data = array('I', values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _section(offsets, blob):
+    # Offsets table followed by the data, padded so the next section is aligned
+    data = _uint32(offsets) + blob
+    return data + b'\0' * (-len(data) % 4)
+
+
+def build(path=INDEX_PATH, wordnet=None):
+    if wordnet is None:
+        from nltk.corpus import wordnet
+
+    words = set(wordnet.all_lemma_names())
+    # Irregular forms ("geese", "ran") are looked up directly too
+    for exceptions in wordnet._exception_map.values():
+        words.update(exceptions)
+    words = sorted(words)
+
+    synset_ids = {}
+    records = []
+    senses = []
+    for word in words:
+        ids = []
+        for synset in wordnet.synsets(word):
+            name = synset.name()
+            if name not in synset_ids:
+                synset_ids[name] = len(records)
+                records.append([synset.pos(), synset.definition(),
+                                [lemma.name() for lemma in synset.lemmas()], synset.examples()])
+            ids.append(synset_ids[name])
+        senses.append(ids)
+
+    word_offsets, word_text = [0], bytearray()
+    for word in words:
+        word_text += word.encode('utf-8')
+        word_offsets.append(len(word_text))
+
+    sense_offsets, sense_list = [0], []
+    for ids in senses:
+        sense_list.extend(ids)
+        sense_offsets.append(4 * len(sense_list))
+
+    record_offsets, record_text = [0], bytearray()
+    for record in records:
+        record_text += json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        record_offsets.append(len(record_text))
+
+    sections = [_section(word_offsets, bytes(word_text)),
+                _section(sense_offsets, _uint32(sense_list)),
+                _section(record_offsets, bytes(record_text))]
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+    offsets.append(position)
+
+    # Written next to the old index and renamed over it, so readers never see half a file
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(words), len(records), *offsets))
+        for section in sections:
+            f.write(section)
+    os.replace(tmp_path, path)
+    return len(words), len(records)
+
+
+class Lexicon:
+    def __init__(self, path=INDEX_PATH):
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.word_count, self.synset_count, *self.sections = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} lexicon index; rebuild it")
+        self.words = _Words(self)
+
+    def _uint(self, section, index):
+        return struct.unpack_from('<I', self.data, self.sections[section] + 4 * index)[0]
+
+    def _span(self, section, count, index):
+        # Start and end of item index in the data that follows a section's offsets table
+        base = self.sections[section] + 4 * (count + 1)
+        return base + self._uint(section, index), base + self._uint(section, index + 1)
+
+    def _word(self, index):
+        start, end = self._span(0, self.word_count, index)
+        return self.data[start:end].decode('utf-8')
+
+    def _senses(self, index):
+        start, end = self._span(1, self.word_count, index)
+        return list(struct.unpack_from(f'<{(end - start) // 4}I', self.data, start))
+
+    def _synset(self, number):
+        start, end = self._span(2, self.synset_count, number)
+        return json.loads(self.data[start:end].decode('utf-8'))
+
+    def _find(self, word):
+        index = bisect.bisect_left(self.words, word)
+        if index < self.word_count and self._word(index) == word:
+            return index
+        return None
+
+    def __contains__(self, word):
+        return self._find(word.lower()) is not None
+
+    def synsets(self, word):
+        # [pos, definition, lemma names, examples] for every sense of word
+        word = word.lower()
+        index = self._find(word)
+        if index is not None:
+            return [self._synset(number) for number in self._senses(index)]
+
+        # Not a dictionary form; try the regular inflections for each part of speech
+        found = []
+        seen = set()
+        for pos, rules in SUBSTITUTIONS.items():
+            for old, new in rules:
+                if not word.endswith(old):
+                    continue
+                base = word[:len(word) - len(old)] + new
+                index = self._find(base)
+                if index is None:
+                    continue
+                for number in self._senses(index):
+                    if number in seen:
+                        continue
+                    synset = self._synset(number)
+                    # Only senses where base itself is the lemma, not ones reached by inflecting it again
+                    if (synset[0] == pos or (pos == 'a' and synset[0] == 's')) and \
+                            base in (lemma.lower() for lemma in synset[2]):
+                        seen.add(number)
+                        found.append(synset)
+        return found
+
+    def lookup(self, word):
+        synsets = self.synsets(word)
+        return Entry([synset[1] for synset in synsets],
+                     list(dict.fromkeys(lemma for synset in synsets for lemma in synset[2])),
+                     [example for synset in synsets for example in synset[3]])
+
+
+class _Words:
+    # Read-only sequence view of the sorted words, for bisect
+    def __init__(self, lexicon):
+        self.lexicon = lexicon
+
+    def __len__(self):
+        return self.lexicon.word_count
+
+    def __getitem__(self, index):
+        return self.lexicon._word(index)
+
+
+def load(path=INDEX_PATH):
+    # Opens the index, compiling it from nltk's WordNet first if there is none yet
+    if not os.path.exists(path):
+        build(path)
+    return Lexicon(path)
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--build']:
+        start = time.perf_counter()
+        words, synsets = build()
+        print(f"Wrote {INDEX_PATH}: {words} words, {synsets} synsets "
+              f"in {time.perf_counter() - start:.1f}s ({os.path.getsize(INDEX_PATH) / 1e6:.1f} MB)")
+    else:
+        entry = load().lookup(' '.join(sys.argv[1:]))
+        for definition in entry.definitions:
+            print(definition)
@@ -0,0 +1,99 @@
+import sys
+import threading
+from collections import OrderedDict
+
+# Bounded least-recently-used cache with hit/miss/eviction counters, shared
+# between handlers that would otherwise repeat the same lookup. Safe to use
+# from the GUI thread and the thread pool at the same time.
+#
+# Given sizeof(key, value), the cache also keeps a running total of the
+# bytes its entries hold, updated as they are added and evicted, so stats()
+# can report memory use without walking every entry.
+
+
+class LRUCache:
+    def __init__(self, maxsize, sizeof=None):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.sizeof = sizeof
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def get(self, key, default=None):
+        with self.lock:
+            try:
+                value = self.items[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            if self.sizeof is not None:
+                if key in self.items:
+                    self.bytes -= self.sizeof(key, self.items[key])
+                self.bytes += self.sizeof(key, value)
+            self.items[key] = value
+            self.items.move_to_end(key)
+            self._evict()
+
+    def pop(self, key, default=None):
+        with self.lock:
+            value = self.items.pop(key, default)
+            if self.sizeof is not None and value is not default:
+                self.bytes -= self.sizeof(key, value)
+            return value
+
+    def get_or_compute(self, key, compute):
+        # compute(key) runs outside the lock; two threads missing on the same
+        # key at once both compute it and the later result is kept
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute(key)
+            self.put(key, value)
+        return value
+
+    def resize(self, maxsize):
+        with self.lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.bytes = 0
+
+    def _evict(self):
+        while len(self.items) > self.maxsize:
+            key, value = self.items.popitem(last=False)
+            if self.sizeof is not None:
+                self.bytes -= self.sizeof(key, value)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        stats = {
+            'size': len(self.items),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+        if self.sizeof is not None:
+            # The entries plus the table holding them
+            stats['bytes'] = self.bytes + sys.getsizeof(self.items)
+        return stats
@@ -1,27 +1,34 @@
 import sys
 from PyQt6.QtWidgets import QApplication, QWidget, QLabel, QLineEdit, QPushButton, QTextEdit, QVBoxLayout, QHBoxLayout, QMessageBox, QGridLayout
 from PyQt6.QtGui import QPixmap, QFont
-from PyQt6.QtCore import Qt
-from textblob import TextBlob
-from nltk.corpus import wordnet
-import pyttsx3
-from googletrans import Translator
-from spellchecker import SpellChecker
+from PyQt6.QtCore import Qt, QTimer
 
-# Initialize text-to-speech engine
-eng = pyttsx3.init()
-translator = Translator()
+import engines
+import ngramlang
+import phrasecraft
+import speech
+import symspell
+from workers import LatestJobRunner
 
-# User dictionary and history
-user_dict = set()
-history_tracking = []
-
-# Initialize SpellChecker for German
-german_spell_checker = SpellChecker(language='de')
 
 class PhraseCraftApp(QWidget):
     def __init__(self):
         super().__init__()
+        # History page on show in the output area, None when it shows something else
+        self.history_page = None
+        self.spellcheck_runner = LatestJobRunner(self)
+        self.spellcheck_runner.finished.connect(self.show_spellcheck_result)
+        self.spellcheck_runner.failed.connect(self.show_spellcheck_error)
+        # Live checking: every edit restarts the timer, so the text is checked
+        # once typing pauses, and only the words that changed are checked again
+        self.live_checker = phrasecraft.live_checker()
+        self.live_check_runner = LatestJobRunner(self)
+        self.live_check_runner.finished.connect(self.show_live_check_result)
+        self.live_check_runner.failed.connect(self.show_spellcheck_error)
+        self.live_check_timer = QTimer(self)
+        self.live_check_timer.setSingleShot(True)
+        self.live_check_timer.setInterval(engines.LIVE_CHECK_DELAY_MS)
+        self.live_check_timer.timeout.connect(self.live_check)
         self.init_ui()
 
     def init_ui(self):
@@ -57,6 +64,7 @@ class PhraseCraftApp(QWidget):
         search_layout = QHBoxLayout()
 
         self.text_input = QLineEdit(self)
+        self.text_input.textEdited.connect(lambda _: self.live_check_timer.start())
         self.text_input.setPlaceholderText("Enter text here...")
         self.text_input.setFont(QFont("Arial", 18))
         self.text_input.setFixedHeight(60)
@@ -72,6 +80,8 @@ class PhraseCraftApp(QWidget):
                 border: 2px solid #76b852;
             }
         """)
+        # A result for text that has since been edited is stale, drop it
+        self.text_input.textEdited.connect(self.cancel_spellcheck)
         search_layout.addWidget(self.text_input)
 
         self.btn_spellcheck = QPushButton("Spellcheck", self)
@@ -168,95 +178,100 @@ class PhraseCraftApp(QWidget):
         """)
         layout.addWidget(self.output_area)
 
-    def detect_language(self, text):
-        try:
-            detection = translator.detect(text)
-            return detection.lang  # Returns language code
-        except Exception as e:
-            self.output_area.setText(f"Error detecting language: {e}")
-            return None
-
-    def correct_text(self, text, lang):
-        suggestions = {}
-        corrected_text = []
-
-        if lang == 'en':
-            blob = TextBlob(text)
-            corrected_text = str(blob.correct())
-
-        elif lang == 'de':
-            for word in text.split():
-                if word in german_spell_checker:
-                    corrected_text.append(word)
-                else:
-                    suggestion_list = german_spell_checker.candidates(word)
-                    suggestions[word] = list(suggestion_list)
-                    corrected_text.append(german_spell_checker.correction(word))
-
-        return " ".join(corrected_text)
-
     def spellcheck(self):
         text = self.text_input.text()
         if not text:
             QMessageBox.information(self, "Spell Check", "Please enter some text.")
             return
 
-        detected_lang = self.detect_language(text)
+        phrasecraft.add_to_history(text)
+        self.show_output("Checking spelling...")
+        self.spellcheck_runner.submit(self.check_spelling, text)
+
+    def cancel_spellcheck(self):
+        # Editing the text drops the pending check, so its status goes too
+        self.spellcheck_runner.cancel()
+        if self.output_area.toPlainText() == "Checking spelling...":
+            self.show_output("")
+
+    def check_spelling(self, text):
+        # Runs in the worker pool, so it must not touch any widgets
+        detected_lang = phrasecraft.detect_language(text)
         if detected_lang is None:
-            QMessageBox.information(self, "Error", "Could not detect the language.")
-            return
+            return text, None, None
+        return text, detected_lang, phrasecraft.correct(text, detected_lang)
 
-        history_tracking.append(text)
-        corrected_text = self.correct_text(text, detected_lang)
+    def show_spellcheck_result(self, result):
+        text, detected_lang, corrected_text = result
 
-        if corrected_text and corrected_text != text:
-            self.output_area.setText(f"Corrected Text: {corrected_text}")
+        if detected_lang is None:
+            QMessageBox.information(self, "Error", "Could not detect the language.")
+        elif corrected_text and corrected_text != text:
+            self.show_output(f"Corrected Text: {corrected_text}")
         else:
-            self.output_area.setText("No spelling errors found.")
+            self.show_output("No spelling errors found.")
+
+    def show_spellcheck_error(self, error):
+        self.show_output(f"Spellcheck failed: {error}")
+
+    def live_check(self):
+        self.live_check_runner.submit(self.live_checker.update, self.text_input.text())
+
+    def show_live_check_result(self, result):
+        _, _, misspelled = result
+        if misspelled:
+            self.show_output("Possible misspellings: " + ", ".join(
+                f"{word} -> {correction}" for _, word, _, correction in misspelled))
+        elif self.output_area.toPlainText().startswith("Possible misspellings"):
+            # The words pointed out earlier have since been fixed
+            self.show_output("No spelling errors found.")
 
     def pronounce_word(self):
         word = self.text_input.text()
-        eng.say(word)
-        eng.runAndWait()
+        speech.say(word)
 
     def get_word_info(self):
         word = self.text_input.text()
-        synsets = wordnet.synsets(word)
-        meanings = [syn.definition() for syn in synsets] if synsets else []
+        meanings = phrasecraft.definitions(word)
         output = f"Word: {word}\nMeanings: {meanings}"
-        self.output_area.setText(output)
+        self.show_output(output)
 
     def get_synonyms(self):
         word = self.text_input.text()
-        synonyms = set()
-
-        for syn in wordnet.synsets(word):
-            for lemma in syn.lemmas():
-                synonyms.add(lemma.name())
+        synonyms = phrasecraft.synonyms(word)
 
         if synonyms:
-            self.output_area.setText(f"Synonyms of '{word}':\n" + ", ".join(synonyms))
+            self.show_output(f"Synonyms of '{word}':\n" + ", ".join(synonyms))
         else:
-            self.output_area.setText(f"No synonyms found for '{word}'.")
+            self.show_output(f"No synonyms found for '{word}'.")
 
     def add_to_user_dict(self):
         word = self.text_input.text()
-        user_dict.add(word)
-        self.output_area.setText(f"'{word}' added to My Dictionary.")
+        phrasecraft.add_user_word(word)
+        self.show_output(f"'{word}' added to My Dictionary.")
 
     def display_user_dict(self):
-        if user_dict:
-            self.output_area.setText("My Dictionary:\n" + ", ".join(user_dict))
+        user_words = phrasecraft.user_words()
+        if user_words:
+            self.show_output("My Dictionary:\n" + ", ".join(user_words))
         else:
-            self.output_area.setText("Your dictionary is empty.")
+            self.show_output("Your dictionary is empty.")
+
+    def show_output(self, text):
+        # Anything but a history page replaces the one on show, so the next
+        # Display History click starts from the first page again
+        self.history_page = None
+        self.output_area.setText(text)
 
     def display_history(self):
-        if history_tracking:
-            self.output_area.setText("History:\n" + "\n".join(history_tracking))
-        else:
-            self.output_area.setText("No history available.")
+        # Each click shows the next page of older entries, then starts over
+        page = 0 if self.history_page is None else self.history_page + 1
+        text, page = phrasecraft.history_text(page, "No history available.")
+        self.show_output(text)
+        self.history_page = page
 
     def clear_output(self):
+        self.history_page = None
         self.output_area.clear()
         self.text_input.clear()
 
@@ -264,4 +279,7 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = PhraseCraftApp()
     window.show()
+    # Load the heavy engines in the background once the window is on screen
+    QTimer.singleShot(engines.WARM_UP_DELAY_MS, lambda: engines.warm_up(
+        ngramlang.load_profiles, symspell.english, engines.german_candidates, engines.lexicon, speech.worker))
     sys.exit(app.exec())
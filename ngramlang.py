@@ -0,0 +1,114 @@
+import gzip
+import json
+import math
+import os
+import re
+import sys
+from collections import Counter
+
+# Offline language identification from character n-grams.
+# Each language has a small precomputed profile of its most common 1-3
+# character n-grams with their log-probabilities; the text is scored against
+# every profile (naive Bayes, unseen n-grams get the profile's floor) and the
+# best scoring language wins. Profiles are built from pyspellchecker's word
+# frequency lists, so no network access or extra corpus is needed.
+
+PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'langprofiles.json')
+LANGUAGES = ['en', 'de', 'fr', 'es', 'it', 'pt', 'nl']
+NGRAM_SIZES = (1, 2, 3)
+PROFILE_SIZE = 1500
+# With a default language, detect() only overrides it for text with at least
+# MIN_LETTERS letters whose best language beats the runner-up by MIN_MARGIN
+# (average log-probability per n-gram); a single short word looks like several
+# languages at once and is better left to the default
+MIN_LETTERS = 6
+MIN_MARGIN = 0.1
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+_profiles = None
+
+
+def ngrams(text):
+    # Words are padded with spaces so n-grams at the start and end of a word count separately
+    for word in WORD_PATTERN.findall(text.lower()):
+        padded = f" {word} "
+        for n in NGRAM_SIZES:
+            for i in range(len(padded) - n + 1):
+                gram = padded[i:i + n]
+                if gram != ' ':
+                    yield gram
+
+
+def build_profile(frequencies, size=PROFILE_SIZE):
+    counts = Counter()
+    for word, count in frequencies.items():
+        for gram in ngrams(word):
+            counts[gram] += count
+    total = sum(counts.values())
+    profile = {gram: round(math.log(count / total), 2) for gram, count in counts.most_common(size)}
+    # Anything outside the profile is rarer than its least common entry
+    floor = min(profile.values()) - 1.0
+    return {'floor': round(floor, 2), 'ngrams': profile}
+
+
+def build_profiles(path=PROFILE_PATH, languages=LANGUAGES):
+    import spellchecker
+    resources = os.path.join(os.path.dirname(spellchecker.__file__), 'resources')
+    profiles = {}
+    for lang in languages:
+        with gzip.open(os.path.join(resources, f'{lang}.json.gz'), 'rt', encoding='utf-8') as f:
+            profiles[lang] = build_profile(json.load(f))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    return profiles
+
+
+def load_profiles(path=PROFILE_PATH):
+    global _profiles
+    if _profiles is None:
+        with open(path, encoding='utf-8') as f:
+            _profiles = json.load(f)
+    return _profiles
+
+
+def _scores(grams, languages=None):
+    result = {}
+    for lang, profile in load_profiles().items():
+        if languages is not None and lang not in languages:
+            continue
+        table = profile['ngrams']
+        floor = profile['floor']
+        result[lang] = sum(table.get(gram, floor) * count for gram, count in grams.items())
+    return result
+
+
+def scores(text, languages=None):
+    grams = Counter(ngrams(text))
+    return _scores(grams, languages) if grams else {}
+
+
+def detect(text, languages=None, default=None):
+    # Language code of the best matching profile among languages (all of them
+    # by default), or None if text has no letters. Given a default, text too
+    # short or too close to call gets the default instead
+    grams = Counter(ngrams(text))
+    if not grams:
+        return None
+    result = _scores(grams, languages)
+    ranked = sorted(result, key=result.get, reverse=True)
+    if default is None or len(ranked) < 2:
+        return ranked[0]
+    letters = sum(len(word) for word in WORD_PATTERN.findall(text))
+    margin = (result[ranked[0]] - result[ranked[1]]) / sum(grams.values())
+    if letters < MIN_LETTERS or margin < MIN_MARGIN:
+        return default
+    return ranked[0]
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--build']:
+        build_profiles()
+        print(f"Wrote {PROFILE_PATH}")
+    else:
+        print(detect(' '.join(sys.argv[1:])))
@@ -0,0 +1,209 @@
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+import numpy as np
+
+import pronunciation
+
+# Phonetic transcription of whole word lists.
+# Calling g2p_en once per word runs its GRU encoder/decoder on a batch of one,
+# which leaves NumPy doing tiny matrix products in a Python loop. Here the list
+# is deduplicated, everything CMUdict or the pronunciation cache already knows
+# is answered directly, and only the remaining words go through the model, in
+# padded batches of similar length so each step is one matrix product for the
+# whole batch. The weights are read straight from g2p_en's checkpoint, so its
+# nltk-heavy import (and tagger download) is skipped entirely.
+#
+#   python phonetics_batch.py words.txt --processes 4 --human > phonetics.tsv
+
+BATCH_SIZE = 256
+MAX_PHONEMES = 20
+
+GRAPHEMES = ["<pad>", "<unk>", "</s>"] + list("abcdefghijklmnopqrstuvwxyz")
+PHONEMES = ["<pad>", "<unk>", "<s>", "</s>"] + [
+    'AA0', 'AA1', 'AA2', 'AE0', 'AE1', 'AE2', 'AH0', 'AH1', 'AH2', 'AO0',
+    'AO1', 'AO2', 'AW0', 'AW1', 'AW2', 'AY0', 'AY1', 'AY2', 'B', 'CH', 'D', 'DH',
+    'EH0', 'EH1', 'EH2', 'ER0', 'ER1', 'ER2', 'EY0', 'EY1', 'EY2', 'F', 'G', 'HH',
+    'IH0', 'IH1', 'IH2', 'IY0', 'IY1', 'IY2', 'JH', 'K', 'L', 'M', 'N', 'NG',
+    'OW0', 'OW1', 'OW2', 'OY0', 'OY1', 'OY2', 'P', 'R', 'S', 'SH', 'T', 'TH',
+    'UH0', 'UH1', 'UH2', 'UW', 'UW0', 'UW1', 'UW2', 'V', 'W', 'Y', 'Z', 'ZH']
+GRAPHEME_IDS = {g: i for i, g in enumerate(GRAPHEMES)}
+START, END = 2, 3
+
+
+def model_path():
+    # g2p_en ships its weights next to the module; find them without importing it
+    spec = importlib.util.find_spec('g2p_en')
+    if spec is None:
+        raise RuntimeError("g2p_en is not installed")
+    return os.path.join(spec.submodule_search_locations[0], 'checkpoint20.npz')
+
+
+def sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+class BatchG2p:
+    def __init__(self, path=None):
+        weights = np.load(path or model_path())
+        for name in ('enc_emb', 'enc_w_ih', 'enc_w_hh', 'enc_b_ih', 'enc_b_hh',
+                     'dec_emb', 'dec_w_ih', 'dec_w_hh', 'dec_b_ih', 'dec_b_hh', 'fc_w', 'fc_b'):
+            setattr(self, name, weights[name])
+        # Transposed once here instead of on every step
+        self.enc_w_ih_t = self.enc_w_ih.T.copy()
+        self.enc_w_hh_t = self.enc_w_hh.T.copy()
+        self.dec_w_ih_t = self.dec_w_ih.T.copy()
+        self.dec_w_hh_t = self.dec_w_hh.T.copy()
+        self.fc_w_t = self.fc_w.T.copy()
+
+    @staticmethod
+    def grucell(x, h, w_ih_t, w_hh_t, b_ih, b_hh):
+        # Same cell as g2p_en, on a (batch, hidden) state
+        rzn_ih = x @ w_ih_t + b_ih
+        rzn_hh = h @ w_hh_t + b_hh
+        split = rzn_ih.shape[-1] * 2 // 3
+        r, z = np.split(sigmoid(rzn_ih[:, :split] + rzn_hh[:, :split]), 2, -1)
+        n = np.tanh(rzn_ih[:, split:] + r * rzn_hh[:, split:])
+        return (1 - z) * n + z * h
+
+    def encode(self, words):
+        # Each word is its graphemes plus </s>, padded to the longest in the batch
+        lengths = np.array([len(word) + 1 for word in words])
+        ids = np.zeros((len(words), lengths.max()), np.int64)
+        for row, word in enumerate(words):
+            ids[row, :len(word)] = [GRAPHEME_IDS.get(char, 1) for char in word]
+            ids[row, len(word)] = GRAPHEME_IDS["</s>"]
+        x = np.take(self.enc_emb, ids, axis=0)
+
+        h = np.zeros((len(words), self.enc_w_hh.shape[1]), np.float32)
+        for t in range(ids.shape[1]):
+            h_next = self.grucell(x[:, t, :], h, self.enc_w_ih_t, self.enc_w_hh_t, self.enc_b_ih, self.enc_b_hh)
+            # Padding must not move the state of words that have already ended
+            h = np.where((t < lengths)[:, None], h_next, h)
+        return h
+
+    def predict(self, words):
+        # Greedy decoding for the whole batch; a word stops at its first </s>
+        h = self.encode(words)
+        dec = np.take(self.dec_emb, np.full(len(words), START), axis=0)
+        preds = np.full((len(words), MAX_PHONEMES), END)
+        done = np.zeros(len(words), bool)
+        for step in range(MAX_PHONEMES):
+            h = self.grucell(dec, h, self.dec_w_ih_t, self.dec_w_hh_t, self.dec_b_ih, self.dec_b_hh)
+            pred = (h @ self.fc_w_t + self.fc_b).argmax(-1)
+            done |= pred == END
+            preds[~done, step] = pred[~done]
+            if done.all():
+                break
+            dec = np.take(self.dec_emb, pred, axis=0)
+
+        results = []
+        for row in preds:
+            phonemes = []
+            for idx in row:
+                if idx == END:
+                    break
+                phonemes.append(PHONEMES[idx])
+            results.append(phonemes)
+        return results
+
+    def predict_all(self, words, batch_size=BATCH_SIZE):
+        return [phonemes for batch in batches(words, batch_size) for phonemes in self.predict(batch)]
+
+
+def batches(words, batch_size=BATCH_SIZE):
+    for start in range(0, len(words), batch_size):
+        yield words[start:start + batch_size]
+
+
+_model = None
+
+
+def _init_worker(path):
+    # Each worker process loads the weights once and reuses them for every batch
+    global _model
+    _model = BatchG2p(path)
+
+
+def _predict_batch(words):
+    return _model.predict(words)
+
+
+def transcribe(words, batch_size=BATCH_SIZE, processes=1, resolver=None, model=None):
+    # {word: phonemes} for every distinct word, plus where each answer came from
+    resolver = resolver or pronunciation.resolver
+    unique = list(dict.fromkeys(word.lower() for word in words))
+
+    results = {}
+    unknown = []
+    for word in unique:
+        phonemes = resolver.lookup(word)
+        if phonemes is None:
+            unknown.append(word)
+        else:
+            results[word] = phonemes
+    stats = {'words': len(words), 'unique': len(unique), 'dictionary': len(results), 'model': len(unknown)}
+
+    if unknown:
+        # Similar lengths in the same batch keep padding to a minimum
+        unknown.sort(key=len)
+        if processes > 1:
+            from multiprocessing import Pool
+            with Pool(processes, initializer=_init_worker, initargs=(model_path(),)) as pool:
+                # imap keeps the batches in order
+                predicted = [phonemes for batch in pool.imap(_predict_batch, batches(unknown, batch_size))
+                             for phonemes in batch]
+        else:
+            predicted = (model or BatchG2p()).predict_all(unknown, batch_size)
+        new = dict(zip(unknown, predicted))
+        resolver.remember(new)
+        results.update(new)
+    return results, stats
+
+
+def read_words(path):
+    f = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        return [line.strip() for line in f if line.strip()]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Phonetic transcriptions for a list of words, one per line")
+    parser.add_argument('input', help="word list, or - for stdin")
+    parser.add_argument('-o', '--output', help="TSV output (default: stdout)")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--processes', type=int, default=1, help="worker processes for the model")
+    parser.add_argument('--human', action='store_true', help="add a readable column next to the ARPAbet")
+    args = parser.parse_args()
+
+    words = read_words(args.input)
+    start = time.perf_counter()
+    results, stats = transcribe(words, args.batch_size, args.processes)
+    elapsed = time.perf_counter() - start
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for word in words:
+            phonemes = results[word.lower()]
+            row = [word, ' '.join(phonemes)]
+            if args.human:
+                row.append(pronunciation.to_human(phonemes))
+            out.write('\t'.join(row) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    rate = stats['words'] / elapsed if elapsed else float('inf')
+    print(f"{stats['words']} words ({stats['unique']} distinct): "
+          f"{stats['dictionary']} from dictionary/cache, {stats['model']} through the model "
+          f"in {elapsed:.2f}s ({rate:.0f} words/s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
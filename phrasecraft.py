@@ -0,0 +1,195 @@
+import argparse
+import json
+
+import engines
+import history
+import pronunciation
+import spelling
+from userdict import user_dictionary
+
+# PhraseCraft without the window.
+# Everything the windows can do with a word or a sentence is available here
+# as plain functions, and the windows are thin clients of them. Nothing here
+# (or anything it imports) touches Qt, so scripts, batch jobs and services
+# can use it without a display and without paying for PyQt6's import.
+#
+#   python phrasecraft.py check "Ther is no plase like hom"
+#   python phrasecraft.py synonyms happy
+#   python phrasecraft.py define serendipity --json
+#   python phrasecraft.py phonetics "hello world"
+#
+# Each engine loads on first use, so a one-shot command only pays for the
+# engine it needs; benchmarks/bench_cli.py measures them. With --token-cache,
+# check skips even that when every word was seen in an earlier run.
+
+
+class CheckResult:
+    __slots__ = ('text', 'lang', 'corrected', 'misspelled')
+
+    def __init__(self, text, lang, corrected, misspelled):
+        self.text = text
+        self.lang = lang
+        self.corrected = corrected
+        # (offset, word, suggestions, correction) for each word that changed
+        self.misspelled = misspelled
+
+
+def detect_language(text):
+    return spelling.detect_language(text)
+
+
+def correct(text, lang='en'):
+    # text with every misspelled word replaced; unchanged for a language with no corrector
+    return spelling.correct_text(text, lang)
+
+
+def check(text, lang=None):
+    # Detects the language unless given; lang is None when text has no letters
+    if lang is None:
+        lang = detect_language(text)
+        if lang is None:
+            return CheckResult(text, None, text, [])
+    corrected, misspelled = spelling.correct_line(text, lang)
+    return CheckResult(text, lang, corrected, misspelled)
+
+
+def live_checker(lang=None):
+    # Checks text as it is typed, re-checking only the edited words; lang=None
+    # detects the language on every update
+    return spelling.IncrementalChecker(lang)
+
+
+def add_user_word(word):
+    # Words in the user's dictionary are never corrected; kept between sessions
+    return user_dictionary.add(word)
+
+
+def remove_user_word(word):
+    return user_dictionary.discard(word)
+
+
+def user_words():
+    return user_dictionary.list()
+
+
+def add_to_history(text):
+    history.history.add(text)
+
+
+def history_page(number, size=history.PAGE_SIZE):
+    # ([(text, times checked), ...], page count); page 0 is the most recent
+    return history.history.page(number, size)
+
+
+def history_text(number, empty="History is empty."):
+    # History page number ready to show, and the page it shows; past the last
+    # page it starts over at page 0, and with no history it is (empty, None)
+    entries, pages = history_page(number)
+    if not entries and number:
+        number = 0
+        entries, pages = history_page(0)
+    if not entries:
+        return empty, None
+    lines = [text if count == 1 else f"{text} ({count}x)" for text, count in entries]
+    return f"History (page {number + 1} of {pages}):\n" + "\n".join(lines), number
+
+
+def definitions(word):
+    return engines.word_info(word).definitions
+
+
+def synonyms(word):
+    return engines.word_info(word).synonyms
+
+
+def examples(word):
+    return engines.word_info(word).examples
+
+
+def phonetics(text):
+    # ARPAbet phonemes (' ' between words) and a readable spelling of them
+    phonemes = pronunciation.resolver.text(text)
+    return phonemes, pronunciation.to_human(phonemes)
+
+
+def _check_command(args):
+    if args.token_cache:
+        spelling.load_token_cache(args.token_cache)
+    result = check(args.text, args.lang)
+    if args.token_cache:
+        spelling.save_token_cache(args.token_cache)
+    if args.json:
+        return {'text': result.text, 'lang': result.lang, 'corrected': result.corrected,
+                'misspelled': [{'offset': offset, 'original': word, 'suggestions': suggestions,
+                                'correction': correction}
+                               for offset, word, suggestions, correction in result.misspelled]}
+    if result.lang is None:
+        return "No words to check."
+    if result.lang not in spelling.CORRECTORS:
+        return f"No spellchecker for language '{result.lang}'."
+    if not result.misspelled:
+        return "No spelling errors found."
+    lines = [result.corrected]
+    for _, word, suggestions, correction in result.misspelled:
+        lines.append(f"  {word} -> {correction}" + (f"  ({', '.join(suggestions)})" if suggestions else ""))
+    return '\n'.join(lines)
+
+
+def _synonyms_command(args):
+    found = synonyms(args.word)
+    if args.json:
+        return {'word': args.word, 'synonyms': found}
+    return ", ".join(found) if found else f"No synonyms found for '{args.word}'."
+
+
+def _define_command(args):
+    info = engines.word_info(args.word)
+    if args.json:
+        return {'word': args.word, 'definitions': info.definitions, 'examples': info.examples}
+    if not info.definitions:
+        return f"No definitions found for '{args.word}'."
+    lines = [f"{number}. {definition}" for number, definition in enumerate(info.definitions, 1)]
+    if info.examples:
+        lines.append("Examples: " + "; ".join(info.examples))
+    return '\n'.join(lines)
+
+
+def _phonetics_command(args):
+    phonemes, human = phonetics(args.text)
+    if args.json:
+        return {'text': args.text, 'arpabet': phonemes, 'human': human}
+    return f"{' '.join(p for p in phonemes if p != ' ')}\n{human}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='phrasecraft', description="PhraseCraft from the command line")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--json', action='store_true', help="print the result as JSON")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('check', parents=[common], help="spellcheck a sentence")
+    command.add_argument('text')
+    command.add_argument('--lang', help="language code (default: detect)")
+    command.add_argument('--token-cache', metavar='PATH',
+                         help="reuse spelling results saved in PATH, and save the new ones there")
+    command.set_defaults(run=_check_command)
+
+    command = commands.add_parser('synonyms', parents=[common], help="synonyms of a word")
+    command.add_argument('word')
+    command.set_defaults(run=_synonyms_command)
+
+    command = commands.add_parser('define', parents=[common], help="meanings of a word")
+    command.add_argument('word')
+    command.set_defaults(run=_define_command)
+
+    command = commands.add_parser('phonetics', parents=[common], help="how a word or phrase is pronounced")
+    command.add_argument('text')
+    command.set_defaults(run=_phonetics_command)
+
+    args = parser.parse_args(argv)
+    output = args.run(args)
+    print(json.dumps(output, ensure_ascii=False) if args.json else output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,305 @@
+import argparse
+import asyncio
+import collections
+import gc
+import json
+import signal
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import engines
+import ngramlang
+import phrasecraft
+import spelling
+import symspell
+
+# PhraseCraft as a local HTTP/JSON service.
+# One long-running process holds a single warm copy of every engine, so other
+# tools get corrections, meanings and synonyms without loading them
+# themselves. Requests are answered from an asyncio loop; the engine work
+# runs on one background thread. Concurrent requests for the same endpoint
+# are collected into micro-batches (up to BATCH_SIZE requests, waiting at
+# most BATCH_DELAY_S after the first), which go to that thread in a single
+# hand-off, and repeated questions within a batch are answered once.
+#
+#   python phrasecraft_server.py --port 8765
+#   curl -d '{"text": "Ther is no plase like hom"}' localhost:8765/check
+#   curl 'localhost:8765/synonyms?word=happy'
+#   curl 'localhost:8765/define?word=serendipity'
+#   curl localhost:8765/stats
+#
+# /stats reports QPS over the last QPS_WINDOW_S seconds and p50/p99 latency
+# over the last LATENCY_SAMPLES requests of each endpoint;
+# benchmarks/bench_server.py load-tests it.
+
+HOST = '127.0.0.1'
+PORT = 8765
+BATCH_SIZE = 64
+BATCH_DELAY_S = 0.002
+LATENCY_SAMPLES = 10000
+QPS_WINDOW_S = 10.0
+MAX_BODY = 1 << 20
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class LatencyStats:
+    def __init__(self, samples=LATENCY_SAMPLES, window=QPS_WINDOW_S):
+        self.latencies = collections.deque(maxlen=samples)
+        self.finished = collections.deque()
+        self.window = window
+        self.count = 0
+        self.errors = 0
+
+    def record(self, latency, now, error=False):
+        self.latencies.append(latency)
+        self.finished.append(now)
+        self.count += 1
+        self.errors += error
+
+    def report(self, now):
+        while self.finished and self.finished[0] < now - self.window:
+            self.finished.popleft()
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+        return {'requests': self.count, 'errors': self.errors,
+                'qps': round(len(self.finished) / self.window, 1),
+                'p50_ms': percentile(0.50), 'p99_ms': percentile(0.99)}
+
+
+class MicroBatcher:
+    # Collects submitted items and runs func on each distinct one, a batch at
+    # a time, on the executor; submit() resolves with that item's result
+    def __init__(self, func, executor, batch_size=BATCH_SIZE, delay=BATCH_DELAY_S):
+        self.func = func
+        self.executor = executor
+        self.batch_size = batch_size
+        self.delay = delay
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.items = 0
+        self.task = asyncio.get_running_loop().create_task(self._collect())
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future))
+        return await future
+
+    def report(self):
+        return {'batches': self.batches,
+                'mean_batch': round(self.items / self.batches, 2) if self.batches else None}
+
+    def _run(self, items):
+        results = {}
+        for item in items:
+            if item not in results:
+                try:
+                    results[item] = (True, self.func(*item))
+                except Exception as e:
+                    results[item] = (False, e)
+        return results
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.delay
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self.batches += 1
+            self.items += len(batch)
+            results = await loop.run_in_executor(self.executor, self._run, [item for item, _ in batch])
+            for item, future in batch:
+                if future.done():
+                    continue
+                ok, value = results[item]
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+
+def _check(text, lang):
+    result = phrasecraft.check(text, lang)
+    return {'text': result.text, 'lang': result.lang, 'corrected': result.corrected,
+            'misspelled': [{'offset': offset, 'original': word, 'suggestions': suggestions,
+                            'correction': correction}
+                           for offset, word, suggestions, correction in result.misspelled]}
+
+
+def _synonyms(word):
+    return {'word': word, 'synonyms': phrasecraft.synonyms(word)}
+
+
+def _define(word):
+    info = engines.word_info(word)
+    return {'word': word, 'definitions': info.definitions, 'examples': info.examples}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Service:
+    def __init__(self, batch_size=BATCH_SIZE, delay=BATCH_DELAY_S):
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix='engines')
+        self.started = time.time()
+        # path -> (argument names, function); the batchers are created once the loop is running
+        self.endpoints = {
+            '/check': (('text', 'lang'), _check),
+            '/synonyms': (('word',), _synonyms),
+            '/define': (('word',), _define),
+        }
+        self.batch_size = batch_size
+        self.delay = delay
+        self.batchers = {}
+        self.stats = {path: LatencyStats() for path in self.endpoints}
+
+    async def warm_up(self):
+        # Every engine loaded before the first request instead of by it, and
+        # then frozen so later full collections don't walk them mid-request
+        loop = asyncio.get_running_loop()
+        for engine in (ngramlang.load_profiles, symspell.english, engines.german_candidates, engines.lexicon):
+            await loop.run_in_executor(self.executor, engine)
+        gc.collect()
+        gc.freeze()
+
+    async def start(self, host=HOST, port=PORT):
+        for path, (_, func) in self.endpoints.items():
+            self.batchers[path] = MicroBatcher(func, self.executor, self.batch_size, self.delay)
+        await self.warm_up()
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def report(self):
+        now = time.time()
+        return {'uptime_s': round(now - self.started, 1),
+                'endpoints': {path: dict(stats.report(now), **self.batchers[path].report())
+                              for path, stats in self.stats.items()},
+                'word_info_cache': engines.word_info_cache.stats(),
+                'token_cache': spelling.token_cache_stats()}
+
+    async def respond(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == '/stats':
+            return self.report()
+        if url.path not in self.endpoints:
+            raise HTTPError(404, f"no such endpoint: {url.path}")
+        names, _ = self.endpoints[url.path]
+        if method == 'GET':
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        elif method == 'POST':
+            try:
+                params = json.loads(body or b'{}')
+            except ValueError:
+                raise HTTPError(400, "body is not valid JSON")
+            if not isinstance(params, dict):
+                raise HTTPError(400, "body must be a JSON object")
+        else:
+            raise HTTPError(405, f"{method} not allowed")
+        if not isinstance(params.get(names[0]), str) or not params[names[0]]:
+            raise HTTPError(400, f"missing '{names[0]}'")
+        args = tuple(params.get(name) for name in names)
+        if not all(arg is None or isinstance(arg, str) for arg in args):
+            raise HTTPError(400, f"{', '.join(names)} must be strings")
+        return await self.batchers[url.path].submit(args)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split(None, 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY:
+                    await self.write_response(writer, 413, {'error': "request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and not version.strip().endswith('1.0'))
+
+                start = time.perf_counter()
+                status = 200
+                try:
+                    payload = await self.respond(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except Exception as e:
+                    status, payload = 500, {'error': str(e)}
+                stats = self.stats.get(urlsplit(target).path)
+                if stats is not None:
+                    stats.record(time.perf_counter() - start, time.time(), status != 200)
+                await self.write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            # Client went away or sent something that is not HTTP
+            pass
+        finally:
+            writer.close()
+
+    async def write_response(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(body)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body)
+        await writer.drain()
+
+
+async def serve(host=HOST, port=PORT, batch_size=BATCH_SIZE, delay=BATCH_DELAY_S):
+    service = Service(batch_size, delay)
+    server = await service.start(host, port)
+    print(f"Listening on http://{host}:{port}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve PhraseCraft over HTTP/JSON on localhost")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="most requests per micro-batch")
+    parser.add_argument('--batch-delay-ms', type=float, default=BATCH_DELAY_S * 1000,
+                        help="how long a batch waits for more requests")
+    parser.add_argument('--token-cache', metavar='PATH',
+                        help="load spelling results from PATH at startup and save them there on exit")
+    args = parser.parse_args()
+    if args.token_cache:
+        spelling.load_token_cache(args.token_cache)
+    # Stop the same way on kill as on Ctrl+C, so the cache still gets saved
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        asyncio.run(serve(args.host, args.port, args.batch_size, args.batch_delay_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.token_cache:
+            spelling.save_token_cache(args.token_cache)
+
+
+if __name__ == '__main__':
+    main()
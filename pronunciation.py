@@ -0,0 +1,171 @@
+import json
+import os
+import re
+import threading
+import unicodedata
+
+import engines
+
+# Pronunciations, cheapest source first:
+#   1. CMUdict, a plain dictionary lookup that covers most English words
+#   2. an on-disk cache of everything the neural model has produced before
+#   3. the g2p_en model itself, only for words neither of the above knows
+# Every model result is appended to the cache, so each unknown word goes
+# through the model once.
+
+CACHE_PATH = 'pronunciation_cache.jsonl'
+
+# Text goes through normalize() first, so accented letters and numbers are
+# words this pattern can read rather than gaps in the result
+WORD_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)*")
+NUMBER_PATTERN = re.compile(r"\d+(?:,\d{3})*(?:\.\d+)?")
+
+ONES = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
+        'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen', 'eighteen', 'nineteen']
+TENS = ['', '', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']
+SCALES = [(10 ** 12, 'trillion'), (10 ** 9, 'billion'), (10 ** 6, 'million'), (1000, 'thousand'), (100, 'hundred')]
+
+ARPABET_TO_HUMAN = {
+    'AA': 'ah', 'AA0': 'ah', 'AA1': 'ah', 'AA2': 'ah',
+    'AE': 'ae', 'AE0': 'ae', 'AE1': 'ae', 'AE2': 'ae',
+    'AH': 'uh', 'AH0': 'uh', 'AH1': 'uh', 'AH2': 'uh',
+    'AO': 'aw', 'AO0': 'aw', 'AO1': 'aw', 'AO2': 'aw',
+    'AW': 'ow', 'AW0': 'ow', 'AW1': 'ow', 'AW2': 'ow',
+    'AY': 'ai', 'AY0': 'ai', 'AY1': 'ai', 'AY2': 'ai',
+    'B': 'b',
+    'CH': 'ch',
+    'D': 'd',
+    'DH': 'th',
+    'EH': 'eh', 'EH0': 'eh', 'EH1': 'eh', 'EH2': 'eh',
+    'ER': 'er', 'ER0': 'er', 'ER1': 'er', 'ER2': 'er',
+    'EY': 'ey', 'EY0': 'ey', 'EY1': 'ey', 'EY2': 'ey',
+    'F': 'f',
+    'G': 'g',
+    'HH': 'h',
+    'IH': 'ih', 'IH0': 'ih', 'IH1': 'ih', 'IH2': 'ih',
+    'IY': 'ee', 'IY0': 'ee', 'IY1': 'ee', 'IY2': 'ee',
+    'JH': 'j',
+    'K': 'k',
+    'L': 'l',
+    'M': 'm',
+    'N': 'n',
+    'NG': 'ng',
+    'OW': 'oh', 'OW0': 'oh', 'OW1': 'oh', 'OW2': 'oh',
+    'OY': 'oi', 'OY0': 'oi', 'OY1': 'oi', 'OY2': 'oi',
+    'P': 'p',
+    'R': 'r',
+    'S': 's',
+    'SH': 'sh',
+    'T': 't',
+    'TH': 'th',
+    'UH': 'uh', 'UH0': 'uh', 'UH1': 'uh', 'UH2': 'uh',
+    'UW': 'oo', 'UW0': 'oo', 'UW1': 'oo', 'UW2': 'oo',
+    'V': 'v',
+    'W': 'w',
+    'Y': 'y',
+    'Z': 'z',
+    'ZH': 'zh'
+}
+
+
+def number_words(n):
+    # English words for a whole number below 10**15, e.g. 42 -> "forty two"
+    if n < 20:
+        return ONES[n]
+    if n < 100:
+        return TENS[n // 10] + (f" {ONES[n % 10]}" if n % 10 else '')
+    for scale, name in SCALES:
+        if n >= scale:
+            rest = n % scale
+            return f"{number_words(n // scale)} {name}" + (f" {number_words(rest)}" if rest else '')
+
+
+def _spell_number(match):
+    whole, _, fraction = match.group().replace(',', '').partition('.')
+    if len(whole) > 15:
+        # Too long to read as one number; read it digit by digit like the fraction
+        words = ' '.join(ONES[int(digit)] for digit in whole)
+    else:
+        words = number_words(int(whole))
+    if fraction:
+        words += ' point ' + ' '.join(ONES[int(digit)] for digit in fraction)
+    return f" {words} "
+
+
+def normalize(text):
+    # Lowercased text with accents dropped (café -> cafe), typographic
+    # apostrophes made plain and numbers spelled out (42 -> forty two)
+    text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return NUMBER_PATTERN.sub(_spell_number, text.replace('\u2019', "'")).lower()
+
+
+def to_human(arpabet_phonemes):
+    return ' '.join(ARPABET_TO_HUMAN.get(phoneme, phoneme) for phoneme in arpabet_phonemes)
+
+
+class PronunciationResolver:
+    def __init__(self, cache_path=CACHE_PATH):
+        self.cache_path = cache_path
+        self.cache = None
+        self.lock = threading.Lock()
+        self.counts = {'cmudict': 0, 'cache': 0, 'model': 0}
+
+    def _load_cache(self):
+        cache = {}
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Last line cut short by a crash mid-write
+                        continue
+                    cache[entry['word']] = entry['phonemes']
+        return cache
+
+    def remember(self, results):
+        # Add model output ({word: phonemes}) to the cache and its file
+        with self.lock:
+            if self.cache is None:
+                self.cache = self._load_cache()
+            self.cache.update(results)
+            with open(self.cache_path, 'a', encoding='utf-8') as f:
+                for word, phonemes in results.items():
+                    f.write(json.dumps({'word': word, 'phonemes': phonemes}) + '\n')
+
+    def lookup(self, word):
+        # Phonemes from CMUdict or the cache, None if only the model knows
+        word = word.lower()
+        pronunciations = engines.cmudict().get(word)
+        if pronunciations:
+            self.counts['cmudict'] += 1
+            return pronunciations[0]
+
+        with self.lock:
+            if self.cache is None:
+                self.cache = self._load_cache()
+            phonemes = self.cache.get(word)
+        if phonemes is not None:
+            self.counts['cache'] += 1
+        return phonemes
+
+    def word(self, word):
+        word = word.lower()
+        phonemes = self.lookup(word)
+        if phonemes is None:
+            phonemes = [p for p in engines.g2p()(word) if p != ' ']
+            self.counts['model'] += 1
+            self.remember({word: phonemes})
+        return phonemes
+
+    def text(self, text):
+        # Phonemes for every word in text, with ' ' between words like g2p_en
+        phonemes = []
+        for word in WORD_PATTERN.findall(normalize(text)):
+            if phonemes:
+                phonemes.append(' ')
+            phonemes.extend(self.word(word))
+        return phonemes
+
+
+resolver = PronunciationResolver()
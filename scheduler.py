@@ -0,0 +1,71 @@
+import heapq
+import time
+
+# Spaced repetition.
+# Each card carries its SM-2 state: when it is next due, its ease factor, the
+# current interval in days and how many times in a row it was recalled. An
+# answer is graded 0-5; a grade of 3 or more stretches the interval by the
+# ease, anything lower starts the card over at one day.
+#
+# ReviewQueue keeps (due, word) pairs in a heap so the next card is found in
+# O(log n) without listing the deck. Entries are never removed in place: a
+# rescheduled or deleted card simply leaves a stale entry behind, which is
+# recognised (its due time no longer matches the card) and dropped when it
+# reaches the top.
+
+DAY_S = 24 * 60 * 60
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+GRADE_CORRECT = 4
+GRADE_WRONG = 1
+
+
+def review(card, grade, now=None):
+    # Apply one SM-2 review to card in place
+    now = time.time() if now is None else now
+    if grade >= 3:
+        if card.repetitions == 0:
+            card.interval = 1
+        elif card.repetitions == 1:
+            card.interval = 6
+        else:
+            card.interval = round(card.interval * card.ease)
+        card.repetitions += 1
+    else:
+        card.repetitions = 0
+        card.interval = 1
+    card.ease = max(MIN_EASE, card.ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    card.due = now + card.interval * DAY_S
+
+
+class ReviewQueue:
+    def __init__(self, flashcards):
+        # flashcards is the manager's word -> card dict, consulted to spot stale entries
+        self.flashcards = flashcards
+        self.heap = [(card.due, word) for word, card in flashcards.items()]
+        heapq.heapify(self.heap)
+
+    def push(self, card):
+        heapq.heappush(self.heap, (card.due, card.word))
+        # Too many stale entries; rebuild from the live cards
+        if len(self.heap) > 2 * len(self.flashcards) + 64:
+            self.heap = [(card.due, word) for word, card in self.flashcards.items()]
+            heapq.heapify(self.heap)
+
+    def peek(self):
+        # The card due soonest, or None if there are no cards
+        while self.heap:
+            due, word = self.heap[0]
+            card = self.flashcards.get(word)
+            if card is not None and card.due == due:
+                return card
+            heapq.heappop(self.heap)
+        return None
+
+    def next_due(self, now=None):
+        # The most overdue card, or None if nothing is due yet
+        now = time.time() if now is None else now
+        card = self.peek()
+        if card is not None and card.due <= now:
+            return card
+        return None
@@ -0,0 +1,73 @@
+import queue
+import threading
+
+# Text-to-speech off the GUI thread.
+# pyttsx3's runAndWait() blocks until the utterance is finished, so speech is
+# handed to a worker thread that owns the engine. Only the newest request
+# matters: queued requests it supersedes are skipped and the utterance being
+# spoken is cut off at the next word.
+
+MAX_PENDING = 2
+
+
+class SpeechWorker(threading.Thread):
+    def __init__(self, max_pending=MAX_PENDING):
+        super().__init__(name='speech', daemon=True)
+        self.requests = queue.Queue(maxsize=max_pending)
+        self.latest = 0
+        self.lock = threading.Lock()
+        self.speaking = None
+
+    def say(self, text):
+        with self.lock:
+            self.latest += 1
+            request = (self.latest, text)
+            # Keep the queue bounded; anything still waiting is out of date anyway
+            while True:
+                try:
+                    self.requests.put_nowait(request)
+                    break
+                except queue.Full:
+                    try:
+                        self.requests.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def is_superseded(self, request_id):
+        return request_id != self.latest
+
+    def _on_word(self, name, location, length):
+        if self.speaking is not None and self.is_superseded(self.speaking):
+            self.engine.stop()
+
+    def run(self):
+        # The engine has to be created and driven from the same thread
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        self.engine.connect('started-word', self._on_word)
+        while True:
+            request_id, text = self.requests.get()
+            if self.is_superseded(request_id):
+                continue
+            self.speaking = request_id
+            self.engine.say(text)
+            self.engine.runAndWait()
+            self.speaking = None
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = SpeechWorker()
+            _worker.start()
+    return _worker
+
+
+def say(text):
+    # Returns immediately; the text is spoken on the speech thread
+    worker().say(text)
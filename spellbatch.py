@@ -0,0 +1,144 @@
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import engines
+import spellstream
+import symspell
+
+# Spellcheck many documents at once, spread over worker processes.
+# Each document goes through the same line-by-line correction as
+# spellstream.py. A worker reads, corrects and writes its own documents and
+# sends back only the counts and misspellings, so the parent never holds the
+# corpus. The dictionaries are loaded once per worker, not once per document;
+# where processes are forked they are loaded in the parent first and the
+# workers share those pages instead of building their own copies.
+#
+#   python spellbatch.py corpus/ -o corrected/ --report report.jsonl --processes 8
+#
+# The report has one line per document, in input order:
+#   {"path": "corpus/a.txt", "lang": "en", "lines": 40, "tokens": 512, "misspelled": [...]}
+
+# Documents handed to a worker at a time; small, as document sizes vary a lot
+CHUNK_SIZE = 4
+DICTIONARIES = {
+    'en': symspell.english,
+    'de': engines.german_candidates,
+}
+
+
+def find_documents(inputs, suffix='.txt'):
+    # (path, path relative to its input) for every file given, and every
+    # suffix file under every directory given, in a stable order
+    for path in inputs:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(suffix):
+                        full = os.path.join(root, name)
+                        yield full, os.path.relpath(full, path)
+        else:
+            yield path, os.path.basename(path)
+
+
+def load_dictionaries(langs):
+    for lang in langs:
+        DICTIONARIES[lang]()
+
+
+_output_dir = None
+_lang = None
+
+
+def _init_worker(output_dir, lang, langs):
+    global _output_dir, _lang
+    _output_dir, _lang = output_dir, lang
+    load_dictionaries(langs)
+
+
+def check_document(job):
+    # Correct one document; runs in a worker
+    path, name = job
+    result = {'path': path, 'lang': None, 'lines': 0, 'tokens': 0, 'misspelled': []}
+    with open(path, encoding='utf-8', newline='') as source:
+        if _lang is None:
+            lang, lines = spellstream.detect_language(source)
+        else:
+            lang, lines = _lang, source
+        result['lang'] = lang
+        output = None
+        if _output_dir is not None:
+            target = os.path.join(_output_dir, name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            output = open(target, 'w', encoding='utf-8', newline='')
+        try:
+            for number, offset, line, corrected, misspelled in spellstream.check_lines(lines, lang):
+                if output is not None:
+                    output.write(corrected)
+                result['lines'] += 1
+                result['tokens'] += len(line.split())
+                result['misspelled'].extend(spellstream.report_records(number, offset, misspelled))
+        finally:
+            if output is not None:
+                output.close()
+    return result
+
+
+def run(inputs, output_dir=None, lang=None, processes=1):
+    # Yields one result per document, in input order
+    jobs = find_documents(inputs)
+    # Which dictionaries each worker needs; with auto-detection, all of them
+    langs = [lang] if lang in DICTIONARIES else ([] if lang else list(DICTIONARIES))
+    initargs = (output_dir, lang, langs)
+    if processes <= 1:
+        _init_worker(*initargs)
+        yield from map(check_document, jobs)
+        return
+    if multiprocessing.get_start_method() == 'fork':
+        # Forked workers inherit these copy-on-write rather than loading their own.
+        # Frozen, the collector never visits them, so a collection in a worker
+        # doesn't write to (and so copy) the pages they are on
+        load_dictionaries(langs)
+        gc.collect()
+        gc.freeze()
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=initargs) as pool:
+        # imap hands out documents as workers free up but returns them in order
+        yield from pool.imap(check_document, jobs, CHUNK_SIZE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spellcheck a collection of text files")
+    parser.add_argument('inputs', nargs='+', help="text files, or directories of .txt files")
+    parser.add_argument('-o', '--output-dir', help="where to write the corrected documents")
+    parser.add_argument('--report', help="JSONL report, one line per document (default: stdout)")
+    parser.add_argument('--lang', help="language of every document (default: detect per document)")
+    parser.add_argument('--processes', type=int, default=os.cpu_count(), help="worker processes")
+    args = parser.parse_args()
+
+    report = open(args.report, 'w', encoding='utf-8') if args.report else sys.stdout
+    start = time.perf_counter()
+    docs = tokens = misspelled = 0
+    try:
+        for result in run(args.inputs, args.output_dir, args.lang, args.processes):
+            report.write(json.dumps(result, ensure_ascii=False) + '\n')
+            docs += 1
+            tokens += result['tokens']
+            misspelled += len(result['misspelled'])
+    finally:
+        if report is not sys.stdout:
+            report.close()
+    elapsed = time.perf_counter() - start
+
+    rate = 1 / elapsed if elapsed else float('inf')
+    print(f"{docs} documents, {tokens} tokens, {misspelled} words corrected in {elapsed:.2f}s "
+          f"with {args.processes} processes ({docs * rate:.1f} docs/s, {tokens * rate:.0f} tokens/s)",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+import json
+import os
+import sys
+import threading
+
+import engines
+import ngramlang
+import symspell
+from lrucache import LRUCache
+from userdict import user_dictionary
+
+# Spelling correction by language, without any Qt.
+# The windows, the streaming checker and anything else that corrects text
+# go through correct_text()/correct_line() here, so every language is
+# handled the same way everywhere.
+#
+# Each language splits text into tokens and checks one token at a time;
+# whether a token is misspelled never depends on its neighbours, which is
+# what lets IncrementalChecker re-check only the tokens that were edited.
+#
+# It also lets results be remembered per (language, token): the same typos
+# turn up again and again, and token_cache answers them without generating
+# candidates a second time. The cache can be saved to TOKEN_CACHE_PATH and
+# loaded in the next session. Words in the user's dictionary are accepted
+# before either the cache or the corrector is asked.
+
+# Distinct (language, token) results kept; resize with token_cache.resize()
+TOKEN_CACHE_SIZE = 100000
+TOKEN_CACHE_PATH = 'token_cache.jsonl'
+
+
+# Language assumed for text too short or ambiguous to tell
+DEFAULT_LANGUAGE = 'en'
+
+
+def detect_language(text):
+    # Only languages that can be corrected are considered; returns None if text has no letters
+    return ngramlang.detect(text, CORRECTORS, DEFAULT_LANGUAGE)
+
+
+def _check_english(token):
+    # (suggestions, correction) for a misspelled token, None if it is fine
+    suggestions, correction = symspell.english().suggest(token)
+    if correction == token:
+        return None
+    return suggestions, correction
+
+
+def _check_german(token):
+    # Only words are looked up; punctuation, spaces and numbers stay as they are
+    if not token.isalpha():
+        return None
+    german_candidates = engines.german_candidates()
+    if token in german_candidates:
+        return None
+    return german_candidates.lookup(token)
+
+
+# lang -> (token pattern, separator the corrected tokens are joined with, token check)
+CORRECTORS = {
+    'en': (symspell.TOKEN_PATTERN, '', _check_english),
+    'de': (symspell.TOKEN_PATTERN, '', _check_german),
+}
+
+
+def _entry_size(key, result):
+    # Approximate bytes held by one cached result: its key and the result
+    size = sys.getsizeof(key) + sys.getsizeof(key[1])
+    if result is not None:
+        suggestions, correction = result
+        size += (sys.getsizeof(result) + sys.getsizeof(suggestions) + sys.getsizeof(correction)
+                 + sum(map(sys.getsizeof, suggestions)))
+    return size
+
+
+token_cache = LRUCache(TOKEN_CACHE_SIZE, _entry_size)
+
+
+def _check_uncached(key):
+    lang, token = key
+    return CORRECTORS[lang][2](token)
+
+
+def check_token(token, lang):
+    # (suggestions, correction) if token is misspelled, None if it is fine
+    if token in user_dictionary:
+        return None
+    return token_cache.get_or_compute((lang, token), _check_uncached)
+
+
+def token_cache_stats():
+    # Includes the approximate bytes held, kept up to date as entries come and go
+    return token_cache.stats()
+
+
+def save_token_cache(path=TOKEN_CACHE_PATH):
+    # Least recently used first, so loading it back keeps the order
+    with token_cache.lock:
+        items = list(token_cache.items.items())
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        for (lang, token), result in items:
+            f.write(json.dumps([lang, token, result], ensure_ascii=False) + '\n')
+    os.replace(temp_path, path)
+
+
+def load_token_cache(path=TOKEN_CACHE_PATH):
+    # Adds the saved results to the cache; returns how many were read
+    if not os.path.exists(path):
+        return 0
+    count = 0
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                lang, token, result = json.loads(line)
+            except ValueError:
+                continue
+            if lang in CORRECTORS:
+                token_cache.put((lang, token), None if result is None else tuple(result))
+                count += 1
+    return count
+
+
+def correct_line(text, lang):
+    # Corrected text plus (offset, word, suggestions, correction) for each
+    # word that was changed; offsets are character positions in text
+    if lang not in CORRECTORS:
+        # Nothing to correct it with, so nothing is changed
+        return text, []
+    pattern, separator, _ = CORRECTORS[lang]
+    corrected = []
+    misspelled = []
+    for match in pattern.finditer(text):
+        token = match.group()
+        result = check_token(token, lang)
+        if result is None:
+            corrected.append(token)
+        else:
+            suggestions, correction = result
+            misspelled.append((match.start(), token, suggestions, correction))
+            corrected.append(correction)
+    return separator.join(corrected), misspelled
+
+
+def correct_text(text, lang):
+    return correct_line(text, lang)[0]
+
+
+class IncrementalChecker:
+    # Spellchecks text that changes a little at a time, like a line being
+    # typed. Each update finds the span that differs from the previous text
+    # (common prefix and suffix), re-tokenizes only that span and checks only
+    # the tokens in it that are new; tokens outside it keep their earlier
+    # results, moved along by however much the text grew or shrank. The
+    # result is always the same as correct_line() on the whole text.
+    def __init__(self, lang=None):
+        # lang=None detects the language on every update
+        self.fixed_lang = lang
+        self.lock = threading.Lock()
+        self.lang = None
+        self.user_dictionary_version = None
+        self.text = ''
+        # (start, end, token, check result) in text order
+        self.tokens = []
+        # Tokens looked up by the last update (token_cache may have answered them)
+        self.checked = 0
+
+    def update(self, text):
+        # Returns (lang, corrected text, misspellings) like correct_line()
+        with self.lock:
+            lang = self.fixed_lang or detect_language(text)
+            if lang not in CORRECTORS:
+                self.lang, self.text, self.tokens, self.checked = lang, text, [], 0
+                return lang, text, []
+            if lang != self.lang or user_dictionary.version != self.user_dictionary_version:
+                # Start over; a word added to or removed from the user's
+                # dictionary changes results the text around it can't show
+                self.lang, self.text, self.tokens = lang, '', []
+                self.user_dictionary_version = user_dictionary.version
+            self._apply(text)
+            return (lang,) + self.result()
+
+    def _apply(self, text):
+        old, tokens = self.text, self.tokens
+        pattern, _, _ = CORRECTORS[self.lang]
+
+        # Unchanged characters at either end
+        limit = min(len(old), len(text))
+        prefix = 0
+        while prefix < limit and old[prefix] == text[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[-1 - suffix] == text[-1 - suffix]:
+            suffix += 1
+        old_suffix_start = len(old) - suffix
+
+        # Tokens that end before the first change, and tokens that start after
+        # the last, are unaffected: whether a token boundary falls between two
+        # characters depends only on those two characters
+        first = 0
+        while first < len(tokens) and tokens[first][1] < prefix:
+            first += 1
+        last = first
+        while last < len(tokens) and tokens[last][0] <= old_suffix_start:
+            last += 1
+        start = tokens[first - 1][1] if first else 0
+        old_end = tokens[last][0] if last < len(tokens) else len(old)
+        shift = len(text) - len(old)
+
+        # Results of the replaced tokens, for any that come back unchanged
+        previous = {token: result for _, _, token, result in tokens[first:last]}
+        middle = []
+        checked = 0
+        for match in pattern.finditer(text, start, old_end + shift):
+            token = match.group()
+            if token in previous:
+                result = previous[token]
+            else:
+                result = check_token(token, self.lang)
+                checked += 1
+            middle.append((match.start(), match.end(), token, result))
+
+        if shift:
+            moved = [(s + shift, e + shift, token, result) for s, e, token, result in tokens[last:]]
+        else:
+            moved = tokens[last:]
+        self.tokens = tokens[:first] + middle + moved
+        self.text = text
+        self.checked = checked
+
+    def result(self):
+        _, separator, _ = CORRECTORS[self.lang]
+        corrected = separator.join(token if result is None else result[1]
+                                   for _, _, token, result in self.tokens)
+        misspelled = [(start, token, result[0], result[1])
+                      for start, _, token, result in self.tokens if result is not None]
+        return corrected, misspelled
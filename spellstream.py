@@ -0,0 +1,102 @@
+import argparse
+import itertools
+import json
+import sys
+import time
+
+import spelling
+
+# Spellcheck a whole document without loading it.
+# The file is read, corrected and written one line at a time through a chain
+# of generators, so memory use depends on the longest line, not the file
+# size. Alongside the corrected text, every changed word goes to a JSONL
+# report as it is found:
+#   {"offset": 1234, "line": 17, "original": "teh", "suggestions": ["the", ...], "correction": "the"}
+# where offset is the word's character position in the input.
+#
+#   python spellstream.py book.txt -o book.corrected.txt --report book.jsonl
+
+# Characters read from the start of the file to detect its language
+SAMPLE_CHARS = 4096
+
+
+def detect_language(lines):
+    # Language of the first SAMPLE_CHARS characters; returns it with an
+    # iterator that still yields every line, including the ones looked at
+    sample = []
+    size = 0
+    for line in lines:
+        sample.append(line)
+        size += len(line)
+        if size >= SAMPLE_CHARS:
+            break
+    return spelling.detect_language(''.join(sample)), itertools.chain(sample, lines)
+
+
+def check_lines(lines, lang):
+    # (line number, offset, original line, corrected line, misspellings) for each line
+    offset = 0
+    for number, line in enumerate(lines, 1):
+        text = line.rstrip('\r\n')
+        ending = line[len(text):]
+        if lang in spelling.CORRECTORS and text.strip():
+            corrected, misspelled = spelling.correct_line(text, lang)
+        else:
+            # Blank lines and languages without a corrector pass through unchanged
+            corrected, misspelled = text, []
+        yield number, offset, line, corrected + ending, misspelled
+        offset += len(line)
+
+
+def report_records(number, offset, misspelled):
+    for word_offset, original, suggestions, correction in misspelled:
+        yield {'offset': offset + word_offset, 'line': number, 'original': original,
+               'suggestions': suggestions, 'correction': correction}
+
+
+def stream(source, output, report, lang=None):
+    # Correct source (an iterable of lines) into output, writing the report
+    # as JSON lines; returns counts for the summary
+    if lang is None:
+        lang, source = detect_language(iter(source))
+    stats = {'lang': lang, 'lines': 0, 'chars': 0, 'misspelled': 0}
+    for number, offset, line, corrected, misspelled in check_lines(source, lang):
+        output.write(corrected)
+        if report is not None:
+            for record in report_records(number, offset, misspelled):
+                report.write(json.dumps(record, ensure_ascii=False) + '\n')
+        stats['lines'] += 1
+        stats['chars'] += len(line)
+        stats['misspelled'] += len(misspelled)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spellcheck a text file line by line")
+    parser.add_argument('input', help="text file, or - for stdin")
+    parser.add_argument('-o', '--output', help="corrected text (default: stdout)")
+    parser.add_argument('--report', help="JSONL report of every corrected word")
+    parser.add_argument('--lang', help="language code (default: detect from the start of the file)")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8', newline='')
+    output = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    report = open(args.report, 'w', encoding='utf-8') if args.report else None
+    start = time.perf_counter()
+    try:
+        stats = stream(source, output, report, args.lang)
+    finally:
+        for f in (source, output, report):
+            if f is not None and f not in (sys.stdin, sys.stdout):
+                f.close()
+    elapsed = time.perf_counter() - start
+
+    if stats['lang'] not in spelling.CORRECTORS:
+        print(f"No corrector for language {stats['lang']!r}; text copied unchanged", file=sys.stderr)
+    print(f"{stats['lines']} lines, {stats['misspelled']} words corrected in {elapsed:.2f}s "
+          f"({stats['chars'] / elapsed / 1000:.0f}k chars/s, language {stats['lang']}, "
+          f"{spelling.token_cache.stats()['hit_rate']:.0%} of words answered from the token cache)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
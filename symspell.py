@@ -0,0 +1,255 @@
+import importlib.util
+import os
+import pickle
+import re
+import string
+import threading
+
+# Symmetric-delete spelling correction (SymSpell).
+# Every dictionary word is indexed under all strings reachable from it by
+# deleting up to MAX_EDIT_DISTANCE characters, so looking up a misspelling
+# only needs the deletes of the input instead of every insert/replace/
+# transpose variant that TextBlob's corrector generates.
+
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7
+
+# The English index, saved after it is first built so later processes read it
+# back (pickled, in about a third of the time) instead of generating every
+# delete again. It records which dictionary file (path, mtime, size) and
+# settings it was built from, and is rebuilt when any of them change.
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'symspell_en.idx')
+INDEX_VERSION = 1
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]|\s")
+
+
+def edit_distance(a, b, max_distance):
+    # Optimal string alignment distance, giving up once it exceeds max_distance
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    # Shared prefixes and suffixes never change the distance
+    len_a, len_b = len(a), len(b)
+    shortest = min(len_a, len_b)
+    start = 0
+    while start < shortest and a[start] == b[start]:
+        start += 1
+    end = 0
+    shortest -= start
+    while end < shortest and a[len_a - 1 - end] == b[len_b - 1 - end]:
+        end += 1
+    a = a[start:len_a - end]
+    b = b[start:len_b - end]
+    if len(a) > len(b):
+        a, b = b, a
+    if len(a) <= 1:
+        # Insert the rest of b around the one character left, if it occurs
+        distance = len(b) - 1 if a and a in b else len(b)
+        return distance if distance <= max_distance else max_distance + 1
+
+    # Only cells within max_distance of the diagonal can stay under the limit
+    limit = max_distance + 1
+    prev_prev = None
+    prev = [j if j <= max_distance else limit for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        char_a = a[i - 1]
+        current = [limit] * (len(b) + 1)
+        if i <= max_distance:
+            current[0] = i
+        row_min = limit
+        for j in range(max(1, i - max_distance), min(len(b), i + max_distance) + 1):
+            char_b = b[j - 1]
+            value = prev[j - 1]
+            if char_a != char_b:
+                if prev[j] < value:
+                    value = prev[j]
+                if current[j - 1] < value:
+                    value = current[j - 1]
+                value += 1
+                if (i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b
+                        and prev_prev[j - 2] + 1 < value):
+                    value = prev_prev[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return limit
+        prev_prev, prev = prev, current
+    return min(prev[-1], limit)
+
+
+class SymSpell:
+    def __init__(self, max_edit_distance=MAX_EDIT_DISTANCE, prefix_length=PREFIX_LENGTH):
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+        self.words = {}
+        self.deletes = {}
+        self.max_length = 0
+
+    def __contains__(self, word):
+        return word in self.words
+
+    def __len__(self):
+        return len(self.words)
+
+    def _edits(self, word, distance, out):
+        distance += 1
+        if len(word) > 1:
+            for i in range(len(word)):
+                delete = word[:i] + word[i + 1:]
+                if delete not in out:
+                    out.add(delete)
+                    if distance < self.max_edit_distance:
+                        self._edits(delete, distance, out)
+        return out
+
+    def _prefix_edits(self, word):
+        prefix = word[:self.prefix_length]
+        edits = self._edits(prefix, 0, set())
+        edits.add(prefix)
+        return edits
+
+    def add_word(self, word, count):
+        if word in self.words:
+            self.words[word] += count
+            return
+        self.words[word] = count
+        self.max_length = max(self.max_length, len(word))
+        for delete in self._prefix_edits(word):
+            self.deletes.setdefault(delete, []).append(word)
+
+    def load_dictionary(self, path):
+        # One "word count" pair per line, ";;;" lines are comments
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.startswith(';;;'):
+                    continue
+                parts = line.split()
+                if len(parts) == 2:
+                    self.add_word(parts[0], int(parts[1]))
+        return self
+
+    def save(self, path, source):
+        # Written next to the old index and renamed over it, so readers never see half a file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((INDEX_VERSION, source, self.max_edit_distance, self.prefix_length,
+                         self.max_length, self.words, self.deletes), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def lookup(self, word):
+        # Known words at the smallest edit distance, most frequent first
+        if word in self.words:
+            return [word]
+        if len(word) - self.max_edit_distance > self.max_length:
+            return []
+
+        # A word at distance d is always indexed under a delete that is at most
+        # d deletes away from the input, so try each distance in turn and only
+        # fall back to the wider (and more expensive) search when nothing closer
+        # exists, the same way TextBlob only tries edit2 when edit1 finds nothing
+        edits = self._prefix_edits(word)
+        prefix_length = min(len(word), self.prefix_length)
+        best = []
+        for max_distance in range(1, self.max_edit_distance + 1):
+            seen = set()
+            for delete in edits:
+                if prefix_length - len(delete) > max_distance:
+                    continue
+                for candidate in self.deletes.get(delete, ()):
+                    if candidate in seen or abs(len(candidate) - len(word)) > max_distance:
+                        continue
+                    seen.add(candidate)
+                    if edit_distance(word, candidate, max_distance) <= max_distance:
+                        best.append(candidate)
+            if best:
+                break
+
+        # Same ordering as TextBlob: highest count first, ties by word descending
+        best.sort(key=lambda w: (self.words[w], w), reverse=True)
+        return best
+
+    def suggest(self, word):
+        # Candidates and the chosen correction from a single lookup, picking the
+        # correction the same way TextBlob does; the correction is word itself
+        # when it is left alone
+        if len(word) == 1 or word in string.punctuation or word in string.whitespace:
+            return [], word
+        if word.replace('.', '').isdigit():
+            return [], word
+        candidates = self.lookup(word)
+        if not candidates:
+            return candidates, word
+        if word.istitle():
+            return candidates, candidates[0].title()
+        return candidates, candidates[0]
+
+    def correction(self, word):
+        return self.suggest(word)[1]
+
+    def correct(self, text):
+        return ''.join(self.correction(token) for token in TOKEN_PATTERN.findall(text))
+
+
+_english = None
+_english_lock = threading.Lock()
+# How english() got its index: 'loaded' from INDEX_PATH or 'built' from the dictionary
+english_origin = None
+
+
+def english_dictionary_path():
+    # The same frequency list TextBlob's corrector is trained on; found without
+    # importing textblob, which would pull in all of nltk
+    spec = importlib.util.find_spec('textblob')
+    return os.path.join(os.path.dirname(spec.origin), 'en', 'en-spelling.txt')
+
+
+def dictionary_source(path):
+    # What a saved index was built from; any change to the file shows up here
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def load_index(path, source):
+    # The SymSpell saved at path, or None if there is none or it was built
+    # from another dictionary or with other settings
+    try:
+        with open(path, 'rb') as f:
+            version, saved_source, max_edit_distance, prefix_length, max_length, words, deletes = pickle.load(f)
+    except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+        return None
+    if (version, saved_source, max_edit_distance, prefix_length) != (
+            INDEX_VERSION, source, MAX_EDIT_DISTANCE, PREFIX_LENGTH):
+        return None
+    checker = SymSpell(max_edit_distance, prefix_length)
+    checker.max_length, checker.words, checker.deletes = max_length, words, deletes
+    return checker
+
+
+def english():
+    # Built once; the lock keeps a background warm-up and a spellcheck job
+    # from building it twice
+    global _english, english_origin
+    with _english_lock:
+        if _english is None:
+            path = english_dictionary_path()
+            source = dictionary_source(path)
+            _english = load_index(INDEX_PATH, source)
+            english_origin = 'loaded'
+            if _english is None:
+                _english = SymSpell().load_dictionary(path)
+                english_origin = 'built'
+                try:
+                    _english.save(INDEX_PATH, source)
+                except OSError:
+                    # Read-only install; it is built again next time
+                    pass
+    return _english
+
+
+def correct(text):
+    # Drop-in replacement for str(TextBlob(text).correct())
+    return english().correct(text)
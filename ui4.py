@@ -1,74 +1,41 @@
 import sys
 from PyQt6.QtWidgets import (QApplication, QWidget, QLabel, QLineEdit, QPushButton, QTextEdit, QVBoxLayout, QHBoxLayout, 
-                             QMessageBox, QGridLayout, QTabWidget, QListWidget, QInputDialog)
+                             QMessageBox, QGridLayout, QTabWidget, QListView, QInputDialog, QCheckBox)
 from PyQt6.QtGui import QPixmap, QFont
-from PyQt6.QtCore import Qt
-from textblob import TextBlob
-from nltk.corpus import wordnet
-import pyttsx3
-from g2p_en import G2p
-import random
-import json
-
-# Initialize text-to-speech engine
-eng = pyttsx3.init()
-
-g2p = G2p()
-
-class Flashcard:
-    def __init__(self, word, meaning, synonyms, example):
-        self.word = word
-        self.meaning = meaning
-        self.synonyms = synonyms
-        self.example = example
-        self.reviewed_count = 0
-        self.correct_count = 0
-
-class FlashcardManager:
-    def __init__(self):
-        self.flashcards = {}
-        self.load_flashcards()
-
-    def add_flashcard(self, word, meaning, synonyms, example):
-        self.flashcards[word] = Flashcard(word, meaning, synonyms, example)
-        self.save_flashcards()
-
-    def delete_flashcard(self, word):
-        if word in self.flashcards:
-            del self.flashcards[word]
-            self.save_flashcards()
-
-    def get_flashcard(self, word):
-        return self.flashcards.get(word)
-
-    def get_all_flashcards(self):
-        return list(self.flashcards.values())
-
-    def update_flashcard_progress(self, word, is_correct):
-        if word in self.flashcards:
-            self.flashcards[word].reviewed_count += 1
-            if is_correct:
-                self.flashcards[word].correct_count += 1
-            self.save_flashcards()
-
-    def save_flashcards(self):
-        with open('flashcards.json', 'w') as f:
-            json.dump({word: vars(card) for word, card in self.flashcards.items()}, f)
-
-    def load_flashcards(self):
-        try:
-            with open('flashcards.json', 'r') as f:
-                data = json.load(f)
-                self.flashcards = {word: Flashcard(**card_data) for word, card_data in data.items()}
-        except FileNotFoundError:
-            self.flashcards = {}
+from PyQt6.QtCore import Qt, QTimer
+
+import engines
+from flashcard_model import FlashcardListModel
+from flashcards import FlashcardManager
+import phrasecraft
+import speech
+import symspell
+from workers import LatestJobRunner
 
 class PhraseCraftApp(QWidget):
     def __init__(self):
         super().__init__()
+        self.spellcheck_runner = LatestJobRunner(self)
+        self.spellcheck_runner.finished.connect(self.show_spellcheck_result)
+        self.spellcheck_runner.failed.connect(self.show_spellcheck_error)
+        # Live checking: every edit restarts the timer, so the text is checked
+        # once typing pauses, and only the words that changed are checked again
+        self.live_checker = phrasecraft.live_checker('en')
+        self.live_check_runner = LatestJobRunner(self)
+        self.live_check_runner.finished.connect(self.show_live_check_result)
+        self.live_check_runner.failed.connect(self.show_spellcheck_error)
+        self.live_check_timer = QTimer(self)
+        self.live_check_timer.setSingleShot(True)
+        self.live_check_timer.setInterval(engines.LIVE_CHECK_DELAY_MS)
+        self.live_check_timer.timeout.connect(self.live_check)
         self.flashcard_manager = FlashcardManager()
         self.init_ui()
 
+    def closeEvent(self, event):
+        # Flush buffered flashcard progress before the window goes away
+        self.flashcard_manager.close()
+        super().closeEvent(event)
+
     def init_ui(self):
         self.setWindowTitle("PhraseCraft v1.0 - Vocabulary Builder")
         self.setGeometry(100, 100, 1200, 800)
@@ -141,20 +108,54 @@ class PhraseCraftApp(QWidget):
         flashcard_review_tab = QWidget()
         flashcard_review_layout = QVBoxLayout()
 
-        self.flashcard_list = QListWidget()
+        self.flashcard_model = FlashcardListModel(self.flashcard_manager, self)
+
+        filter_layout = QHBoxLayout()
+        self.flashcard_filter = QLineEdit()
+        self.flashcard_filter.setPlaceholderText("Search flashcards...")
+        self.flashcard_filter.setFont(QFont("Arial", 16))
+        self.flashcard_filter.setStyleSheet("""
+            QLineEdit {
+                border-radius: 10px;
+                padding: 8px;
+                border: 1px solid #FFEA00;
+                background-color: #2A2A2A;
+                color: white;
+            }
+            QLineEdit:focus {
+                border: 1px solid #76b852;
+            }
+        """)
+        self.flashcard_filter.textChanged.connect(self.filter_flashcards)
+        filter_layout.addWidget(self.flashcard_filter)
+
+        self.flashcard_filter_text = QCheckBox("Search meanings and examples")
+        self.flashcard_filter_text.setFont(QFont("Arial", 14))
+        self.flashcard_filter_text.setStyleSheet("color: white;")
+        self.flashcard_filter_text.toggled.connect(self.filter_flashcards)
+        filter_layout.addWidget(self.flashcard_filter_text)
+        flashcard_review_layout.addLayout(filter_layout)
+
+        self.flashcard_list = QListView()
+        # Every row is one line of text, so the view doesn't need to measure
+        # each one, and rows are laid out in batches between events rather
+        # than all at once, so a large deck doesn't freeze the window
+        self.flashcard_list.setUniformItemSizes(True)
+        self.flashcard_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.flashcard_list.setBatchSize(1000)
+        self.flashcard_list.setModel(self.flashcard_model)
         self.flashcard_list.setFont(QFont("Arial", 16))
         self.flashcard_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 background-color: #2A2A2A;
                 border: 1px solid #FFEA00;
                 border-radius: 5px;
                 color: white;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #66bb6a;
             }
         """)
-        self.update_flashcard_list()
         flashcard_review_layout.addWidget(self.flashcard_list)
 
         review_buttons_layout = QHBoxLayout()
@@ -169,6 +170,11 @@ class PhraseCraftApp(QWidget):
         self.btn_quiz_flashcard.clicked.connect(self.start_quiz)
         review_buttons_layout.addWidget(self.btn_quiz_flashcard)
 
+        self.btn_review_due = QPushButton("Review Due Cards")
+        self.set_button_style(self.btn_review_due)
+        self.btn_review_due.clicked.connect(self.review_due_cards)
+        review_buttons_layout.addWidget(self.btn_review_due)
+
         self.btn_delete_flashcard = QPushButton("Delete Flashcard")
         self.set_button_style(self.btn_delete_flashcard)
         self.btn_delete_flashcard.clicked.connect(self.delete_selected_flashcard)
@@ -205,6 +211,7 @@ class PhraseCraftApp(QWidget):
         search_layout = QHBoxLayout()
 
         self.text_input = QLineEdit(self)
+        self.text_input.textEdited.connect(lambda _: self.live_check_timer.start())
         self.text_input.setPlaceholderText("Enter text here...")
         self.text_input.setFont(QFont("Arial", 18))
         self.text_input.setFixedHeight(60)
@@ -220,6 +227,8 @@ class PhraseCraftApp(QWidget):
                 border: 2px solid #76b852;
             }
         """)
+        # A result for text that has since been edited is stale, drop it
+        self.text_input.textEdited.connect(self.cancel_spellcheck)
         search_layout.addWidget(self.text_input)
 
         self.btn_spellcheck = QPushButton("Spellcheck", self)
@@ -314,8 +323,21 @@ class PhraseCraftApp(QWidget):
 
     def spellcheck(self):
         text = self.text_input.text()
-        blob = TextBlob(text)
-        corrected_text = str(blob.correct())
+        self.output_area.setText("Checking spelling...")
+        self.spellcheck_runner.submit(self.check_spelling, text)
+
+    def cancel_spellcheck(self):
+        # Editing the text drops the pending check, so its status goes too
+        self.spellcheck_runner.cancel()
+        if self.output_area.toPlainText() == "Checking spelling...":
+            self.output_area.setText("")
+
+    def check_spelling(self, text):
+        # Runs in the worker pool, so it must not touch any widgets
+        return text, phrasecraft.correct(text)
+
+    def show_spellcheck_result(self, result):
+        text, corrected_text = result
 
         if corrected_text != text:
             question = f"Did you mean: '{corrected_text}'?"
@@ -323,40 +345,45 @@ class PhraseCraftApp(QWidget):
             
             if reply == QMessageBox.StandardButton.Yes:
                 self.text_input.setText(corrected_text)
+                self.output_area.setText(f"Corrected Text: {corrected_text}")
             else:
                 self.output_area.setText("No better suggestions were found.")
         else:
             self.output_area.setText("No spelling errors found.")
 
+    def show_spellcheck_error(self, error):
+        self.output_area.setText(f"Spellcheck failed: {error}")
+
+    def live_check(self):
+        self.live_check_runner.submit(self.live_checker.update, self.text_input.text())
+
+    def show_live_check_result(self, result):
+        _, _, misspelled = result
+        if misspelled:
+            self.output_area.setText("Possible misspellings: " + ", ".join(
+                f"{word} -> {correction}" for _, word, _, correction in misspelled))
+        elif self.output_area.toPlainText().startswith("Possible misspellings"):
+            # The words pointed out earlier have since been fixed
+            self.output_area.setText("No spelling errors found.")
+
     def pronounce_word(self):
         word = self.text_input.text()
-        eng.say(word)
-        eng.runAndWait()
+        speech.say(word)
 
     def get_word_info(self):
         word = self.text_input.text()
-        synsets = wordnet.synsets(word)
-        meanings = [syn.definition() for syn in synsets] if synsets else []
+        meanings = phrasecraft.definitions(word)
         origins = self.get_word_origin(word)
 
         output = f"Word: {word}\nMeanings: {meanings}\nOrigin: {origins}"
         self.output_area.setText(output)
 
     def get_word_origin(self, word):
-        synsets = wordnet.synsets(word)
-        origins = set()
-        for syn in synsets:
-            for lemma in syn.lemmas():
-                origins.add(lemma.name())
-        return origins
+        return set(phrasecraft.synonyms(word))
 
     def get_synonyms(self):
         word = self.text_input.text()
-        synonyms = set()
-
-        for syn in wordnet.synsets(word):
-            for lemma in syn.lemmas():
-                synonyms.add(lemma.name())
+        synonyms = phrasecraft.synonyms(word)
 
         if synonyms:
             self.output_area.setText(f"Synonyms of '{word}':\n" + ", ".join(synonyms))
@@ -366,157 +393,141 @@ class PhraseCraftApp(QWidget):
     def clear_output(self):
         self.output_area.setText("")
 
-    def arpabet_to_human_conversion(self, arpabet_phonemes):
-    arpabet_to_human = {
-        'AA': 'ah', 'AA0': 'ah', 'AA1': 'ah', 'AA2': 'ah',
-        'AE': 'ae', 'AE0': 'ae', 'AE1': 'ae', 'AE2': 'ae',
-        'AH': 'uh', 'AH0': 'uh', 'AH1': 'uh', 'AH2': 'uh',
-        'AO': 'aw', 'AO0': 'aw', 'AO1': 'aw', 'AO2': 'aw',
-        'AW': 'ow', 'AW0': 'ow', 'AW1': 'ow', 'AW2': 'ow',
-        'AY': 'ai', 'AY0': 'ai', 'AY1': 'ai', 'AY2': 'ai',
-        'B': 'b',
-        'CH': 'ch',
-        'D': 'd',
-        'DH': 'th',
-        'EH': 'eh', 'EH0': 'eh', 'EH1': 'eh', 'EH2': 'eh',
-        'ER': 'er', 'ER0': 'er', 'ER1': 'er', 'ER2': 'er',
-        'EY': 'ey', 'EY0': 'ey', 'EY1': 'ey', 'EY2': 'ey',
-        'F': 'f',
-        'G': 'g',
-        'HH': 'h',
-        'IH': 'ih', 'IH0': 'ih', 'IH1': 'ih', 'IH2': 'ih',
-        'IY': 'ee', 'IY0': 'ee', 'IY1': 'ee', 'IY2': 'ee',
-        'JH': 'j',
-        'K': 'k',
-        'L': 'l',
-        'M': 'm',
-        'N': 'n',
-        'NG': 'ng',
-        'OW': 'oh', 'OW0': 'oh', 'OW1': 'oh', 'OW2': 'oh',
-        'OY': 'oi', 'OY0': 'oi', 'OY1': 'oi', 'OY2': 'oi',
-        'P': 'p',
-        'R': 'r',
-        'S': 's',
-        'SH': 'sh',
-        'T': 't',
-        'TH': 'th',
-        'UH': 'uh', 'UH0': 'uh', 'UH1': 'uh', 'UH2': 'uh',
-        'UW': 'oo', 'UW0': 'oo', 'UW1': 'oo', 'UW2': 'oo',
-        'V': 'v',
-        'W': 'w',
-        'Y': 'y',
-        'Z': 'z',
-        'ZH': 'zh'
-    }
-    human_readable = [arpabet_to_human.get(phoneme, phoneme) for phoneme in arpabet_phonemes]
-    return ' '.join(human_readable)
-  def phonetics(self):
-          word = self.text_input.text()
-          arpabet_phonemes = g2p(word)
-          human_readable_transcription = self.arpabet_to_human_conversion(arpabet_phonemes)
-          self.output_area.setText(f"Phonetics: {human_readable_transcription}")
-  
-      def create_flashcard(self):
-          word = self.text_input.text()
-          if not word:
-              QMessageBox.warning(self, "Error", "Please enter a word first.")
-              return
-  
-          meaning, ok = QInputDialog.getText(self, "Create Flashcard", "Enter the meaning of the word:")
-          if ok and meaning:
-              synonyms, ok = QInputDialog.getText(self, "Create Flashcard", "Enter synonyms (comma-separated):")
-              if ok:
-                  example, ok = QInputDialog.getText(self, "Create Flashcard", "Enter an example sentence:")
-                  if ok:
-                      self.flashcard_manager.add_flashcard(word, meaning, synonyms, example)
-                      self.update_flashcard_list()
-                      self.update_progress_tracking()
-                      QMessageBox.information(self, "Success", f"Flashcard for '{word}' created successfully!")
-  
-      def update_flashcard_list(self):
-          self.flashcard_list.clear()
-          for flashcard in self.flashcard_manager.get_all_flashcards():
-              self.flashcard_list.addItem(flashcard.word)
-  
-      def review_selected_flashcard(self):
-          selected_items = self.flashcard_list.selectedItems()
-          if not selected_items:
-              QMessageBox.warning(self, "Error", "Please select a flashcard to review.")
-              return
-  
-          word = selected_items[0].text()
-          flashcard = self.flashcard_manager.get_flashcard(word)
-          if flashcard:
-              review_text = f"Word: {flashcard.word}\n\n"
-              review_text += f"Meaning: {flashcard.meaning}\n\n"
-              review_text += f"Synonyms: {flashcard.synonyms}\n\n"
-              review_text += f"Example: {flashcard.example}\n\n"
-              review_text += f"Times reviewed: {flashcard.reviewed_count}\n"
-              review_text += f"Correct answers: {flashcard.correct_count}"
-  
-              self.output_area.setText(review_text)
-              self.flashcard_manager.update_flashcard_progress(word, True)
-              self.update_progress_tracking()
-  
-      def start_quiz(self):
-          flashcards = self.flashcard_manager.get_all_flashcards()
-          if not flashcards:
-              QMessageBox.warning(self, "Error", "No flashcards available for quiz.")
-              return
-  
-          flashcard = random.choice(flashcards)
-          user_answer, ok = QInputDialog.getText(self, "Quiz", f"What's the meaning of '{flashcard.word}'?")
-          
-          if ok:
-              is_correct = user_answer.lower() == flashcard.meaning.lower()
-              self.flashcard_manager.update_flashcard_progress(flashcard.word, is_correct)
-              
-              if is_correct:
-                  QMessageBox.information(self, "Quiz Result", "Correct!")
-              else:
-                  QMessageBox.information(self, "Quiz Result", f"Incorrect. The correct meaning is: {flashcard.meaning}")
-  
-              self.update_progress_tracking()
-  
-      def delete_selected_flashcard(self):
-          selected_items = self.flashcard_list.selectedItems()
-          if not selected_items:
-              QMessageBox.warning(self, "Error", "Please select a flashcard to delete.")
-              return
-  
-          word = selected_items[0].text()
-          reply = QMessageBox.question(self, 'Delete Flashcard', 
-                                       f"Are you sure you want to delete the flashcard for '{word}'?",
-                                       QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-  
-          if reply == QMessageBox.StandardButton.Yes:
-              self.flashcard_manager.delete_flashcard(word)
-              self.update_flashcard_list()
-              self.update_progress_tracking()
-              QMessageBox.information(self, "Success", f"Flashcard for '{word}' deleted successfully!")
-  
-      def update_progress_tracking(self):
-          flashcards = self.flashcard_manager.get_all_flashcards()
-          total_words = len(flashcards)
-          total_reviews = sum(card.reviewed_count for card in flashcards)
-          total_correct = sum(card.correct_count for card in flashcards)
-  
-          accuracy = (total_correct / total_reviews * 100) if total_reviews > 0 else 0
-  
-          progress_text = f"Total words learned: {total_words}\n"
-          progress_text += f"Total reviews: {total_reviews}\n"
-          progress_text += f"Correct answers: {total_correct}\n"
-          progress_text += f"Accuracy: {accuracy:.2f}%\n\n"
-          progress_text += "Top 5 most reviewed words:\n"
-  
-          sorted_flashcards = sorted(flashcards, key=lambda x: x.reviewed_count, reverse=True)
-          for i, card in enumerate(sorted_flashcards[:5], 1):
-              progress_text += f"{i}. {card.word} (Reviewed: {card.reviewed_count}, Correct: {card.correct_count})\n"
-  
-          self.progress_text.setText(progress_text)
-  
-  if __name__ == '__main__':
-      app = QApplication(sys.argv)
-      window = PhraseCraftApp()
-      window.show()
-      sys.exit(app.exec())
+    def phonetics(self):
+        word = self.text_input.text()
+        _, human_readable_transcription = phrasecraft.phonetics(word)
+        self.output_area.setText(f"Phonetics: {human_readable_transcription}")
+
+    def create_flashcard(self):
+        word = self.text_input.text()
+        if not word:
+            QMessageBox.warning(self, "Error", "Please enter a word first.")
+            return
+
+        meaning, ok = QInputDialog.getText(self, "Create Flashcard", "Enter the meaning of the word:")
+        if ok and meaning:
+            synonyms, ok = QInputDialog.getText(self, "Create Flashcard", "Enter synonyms (comma-separated):")
+            if ok:
+                example, ok = QInputDialog.getText(self, "Create Flashcard", "Enter an example sentence:")
+                if ok:
+                    self.flashcard_manager.add_flashcard(word, meaning, synonyms, example)
+                    self.flashcard_model.add_word(word)
+                    self.update_progress_tracking()
+                    QMessageBox.information(self, "Success", f"Flashcard for '{word}' created successfully!")
+
+    def filter_flashcards(self):
+        self.flashcard_model.set_filter(self.flashcard_filter.text(), self.flashcard_filter_text.isChecked())
+
+    def selected_flashcard_word(self):
+        index = self.flashcard_list.currentIndex()
+        if not index.isValid() or not self.flashcard_list.selectionModel().isSelected(index):
+            return None
+        return self.flashcard_model.word_at(index.row())
+
+    def review_selected_flashcard(self):
+        word = self.selected_flashcard_word()
+        if word is None:
+            QMessageBox.warning(self, "Error", "Please select a flashcard to review.")
+            return
+
+        flashcard = self.flashcard_manager.get_flashcard(word)
+        if flashcard:
+            review_text = f"Word: {flashcard.word}\n\n"
+            review_text += f"Meaning: {flashcard.meaning}\n\n"
+            review_text += f"Synonyms: {flashcard.synonyms}\n\n"
+            review_text += f"Example: {flashcard.example}\n\n"
+            review_text += f"Times reviewed: {flashcard.reviewed_count}\n"
+            review_text += f"Correct answers: {flashcard.correct_count}"
+
+            self.output_area.setText(review_text)
+            # Viewing a card is not recalling it, so it stays on its schedule
+            self.flashcard_manager.update_flashcard_progress(word, True, schedule=False)
+            self.update_progress_tracking()
+
+    def start_quiz(self):
+        # The card due soonest according to the spaced-repetition schedule
+        flashcard = self.flashcard_manager.next_flashcard()
+        if not flashcard:
+            QMessageBox.warning(self, "Error", "No flashcards available for quiz.")
+            return
+
+        self.quiz_flashcard(flashcard)
+        self.update_progress_tracking()
+
+    def quiz_flashcard(self, flashcard):
+        # Asks for the meaning of one card; returns None if the user cancelled
+        user_answer, ok = QInputDialog.getText(self, "Quiz", f"What's the meaning of '{flashcard.word}'?")
+        if not ok:
+            return None
+
+        is_correct = user_answer.lower() == flashcard.meaning.lower()
+        self.flashcard_manager.update_flashcard_progress(flashcard.word, is_correct)
+
+        if is_correct:
+            QMessageBox.information(self, "Quiz Result", "Correct!")
+        else:
+            QMessageBox.information(self, "Quiz Result", f"Incorrect. The correct meaning is: {flashcard.meaning}")
+        return is_correct
+
+    def review_due_cards(self):
+        # Quiz every card that is due, most overdue first, until none are left or the user cancels
+        reviewed = correct = 0
+        while True:
+            flashcard = self.flashcard_manager.next_due_flashcard()
+            if not flashcard:
+                break
+            is_correct = self.quiz_flashcard(flashcard)
+            if is_correct is None:
+                break
+            reviewed += 1
+            correct += is_correct
+
+        if reviewed:
+            self.update_progress_tracking()
+            QMessageBox.information(self, "Review Session", f"Reviewed {reviewed} cards, {correct} correct.")
+        elif not flashcard:
+            QMessageBox.information(self, "Review Session", "No cards are due for review.")
+
+    def delete_selected_flashcard(self):
+        word = self.selected_flashcard_word()
+        if word is None:
+            QMessageBox.warning(self, "Error", "Please select a flashcard to delete.")
+            return
+
+        reply = QMessageBox.question(self, 'Delete Flashcard', 
+                                     f"Are you sure you want to delete the flashcard for '{word}'?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+
+        if reply == QMessageBox.StandardButton.Yes:
+            self.flashcard_manager.delete_flashcard(word)
+            self.flashcard_model.remove_word(word)
+            self.update_progress_tracking()
+            QMessageBox.information(self, "Success", f"Flashcard for '{word}' deleted successfully!")
+
+    def update_progress_tracking(self):
+        manager = self.flashcard_manager
+        total_words = len(manager.flashcards)
+        total_reviews = manager.total_reviews
+        total_correct = manager.total_correct
+
+        accuracy = (total_correct / total_reviews * 100) if total_reviews > 0 else 0
+
+        progress_text = f"Total words learned: {total_words}\n"
+        progress_text += f"Total reviews: {total_reviews}\n"
+        progress_text += f"Correct answers: {total_correct}\n"
+        progress_text += f"Accuracy: {accuracy:.2f}%\n\n"
+        progress_text += "Top 5 most reviewed words:\n"
+
+        for i, card in enumerate(manager.most_reviewed(), 1):
+            progress_text += f"{i}. {card.word} (Reviewed: {card.reviewed_count}, Correct: {card.correct_count})\n"
+
+        self.progress_text.setText(progress_text)
+
+if __name__ == '__main__':
+    app = QApplication(sys.argv)
+    window = PhraseCraftApp()
+    window.show()
+    # Load the heavy engines in the background once the window is on screen
+    QTimer.singleShot(engines.WARM_UP_DELAY_MS, lambda: engines.warm_up(
+        symspell.english, engines.lexicon, engines.cmudict, speech.worker))
+    sys.exit(app.exec())
@@ -0,0 +1,121 @@
+import os
+import threading
+
+# The user's own words ("My Dictionary"), kept between sessions.
+# The file is an append-only log, one change per line: "+word" when a word is
+# added, "-word" when it is removed, so saving a change never rewrites the
+# file. Replaying the log gives the current set. Once the log holds more than
+# twice as many lines as there are words (and at least COMPACT_MIN_RECORDS),
+# it is rewritten with one "+word" line per word.
+#
+# Words are matched without regard to case and shown as they were typed.
+# The spellchecker asks this set first, so the user's words never reach the
+# (much slower) candidate search.
+
+USER_DICT_PATH = 'user_dictionary.log'
+COMPACT_MIN_RECORDS = 1000
+
+
+class UserDictionary:
+    def __init__(self, path=USER_DICT_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        # lowercased word -> word as the user typed it; None until first used
+        self.words = None
+        self.records = 0
+        # Bumped on every change, so anything that remembers spelling results can tell they may be stale
+        self.version = 0
+
+    def _load(self):
+        words = {}
+        records = 0
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.rstrip('\n')
+                    if len(line) < 2:
+                        # Blank, or the last line cut short by a crash mid-write
+                        continue
+                    records += 1
+                    word = line[1:]
+                    if line[0] == '+':
+                        words[word.lower()] = word
+                    elif line[0] == '-':
+                        words.pop(word.lower(), None)
+        self.words, self.records = words, records
+        self._compact_if_needed()
+
+    def _loaded(self):
+        # Called with the lock held
+        if self.words is None:
+            self._load()
+        return self.words
+
+    def __contains__(self, word):
+        words = self.words
+        if words is None:
+            with self.lock:
+                words = self._loaded()
+        return word.lower() in words
+
+    def __len__(self):
+        with self.lock:
+            return len(self._loaded())
+
+    def list(self):
+        # The words as typed, sorted case-insensitively
+        with self.lock:
+            return sorted(self._loaded().values(), key=str.lower)
+
+    def add(self, word):
+        # False if word is blank or already there
+        word = word.strip()
+        if not word or '\n' in word:
+            return False
+        with self.lock:
+            words = self._loaded()
+            if words.get(word.lower()) == word:
+                return False
+            words[word.lower()] = word
+            self._append('+', word)
+        return True
+
+    def discard(self, word):
+        # False if word was not there
+        word = word.strip()
+        with self.lock:
+            words = self._loaded()
+            if word.lower() not in words:
+                return False
+            del words[word.lower()]
+            self._append('-', word)
+        return True
+
+    def _append(self, op, word):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(f"{op}{word}\n")
+        self.records += 1
+        self.version += 1
+        self._compact_if_needed()
+
+    def _compact_if_needed(self):
+        if self.records >= COMPACT_MIN_RECORDS and self.records > 2 * len(self.words):
+            self._compact()
+
+    def compact(self):
+        with self.lock:
+            self._loaded()
+            self._compact()
+
+    def _compact(self):
+        # Rewrite the log as just the current words; the new file replaces the
+        # old one in a single step, so a crash leaves one or the other
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for word in self.words.values():
+                f.write(f"+{word}\n")
+        os.replace(temp_path, self.path)
+        self.records = len(self.words)
+
+
+user_dictionary = UserDictionary()
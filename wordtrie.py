@@ -0,0 +1,145 @@
+import bisect
+import unicodedata
+
+# Bounded edit-distance search over a trie of dictionary words.
+# The trie is implicit: words are kept in one sorted list and a node is the
+# range of words sharing a prefix, so it costs no memory beyond the list.
+# Walking it computes one edit-distance row per prefix and abandons a branch as
+# soon as every cell in its row is over the limit, so the work depends on how
+# many dictionary prefixes are near the input rather than on generating every
+# edit of the input (which is what pyspellchecker does).
+
+MAX_EDIT_DISTANCE = 2
+SHALLOW_DEPTH = 3
+
+
+def remove_diacritics(word):
+    return ''.join(c for c in unicodedata.normalize('NFKD', word) if not unicodedata.combining(c))
+
+
+class WordTrie:
+    def __init__(self, frequencies, max_edit_distance=MAX_EDIT_DISTANCE):
+        # frequencies maps lowercase words to counts, e.g. the Counter behind
+        # SpellChecker.word_frequency.dictionary
+        self.frequencies = frequencies
+        self.max_edit_distance = max_edit_distance
+        self.words = sorted(frequencies)
+        self._shallow_children = {}
+
+    def __contains__(self, word):
+        return word.lower() in self.frequencies
+
+    def __len__(self):
+        return len(self.words)
+
+    def _children(self, lo, hi, depth):
+        # Every search walks the first levels of the trie, so keep their splits
+        if depth < SHALLOW_DEPTH:
+            key = (lo, depth)
+            if key not in self._shallow_children:
+                self._shallow_children[key] = list(self._split(lo, hi, depth))
+            return self._shallow_children[key]
+        return self._split(lo, hi, depth)
+
+    def _split(self, lo, hi, depth):
+        # Split words[lo:hi], which share a prefix of length depth, by their next character
+        words = self.words
+        if lo < hi and len(words[lo]) == depth:
+            lo += 1
+        while lo < hi:
+            char = words[lo][depth]
+            end = bisect.bisect_left(words, words[lo][:depth] + chr(ord(char) + 1), lo, hi)
+            yield char, lo, end
+            lo = end
+
+    def search(self, word, max_distance):
+        # All dictionary words within max_distance of word, counting inserts,
+        # deletes, replacements and swaps of adjacent letters, with no
+        # restriction on editing the same letters twice; that is what
+        # pyspellchecker's edit2 (two rounds of edit1) reaches
+        results = []
+        limit = max_distance + 1
+        first_row = [j if j <= max_distance else limit for j in range(len(word) + 1)]
+        self._search(word, max_distance, 0, len(self.words), 0, [first_row], {}, results)
+        return results
+
+    def _search(self, word, max_distance, lo, hi, depth, rows, last_row, results):
+        # rows holds the row of every prefix on the way down, and last_row
+        # maps each letter to the last row (1-based) whose prefix ends in it;
+        # a swap can pair a letter with one several rows up (Lowrance-Wagner).
+        # Cells further than max_distance from the diagonal can never come
+        # back under the limit, so only the band around it is computed
+        size = len(word) + 1
+        limit = max_distance + 1
+        row = depth + 1
+        prev = rows[-1]
+        first = max(1, row - max_distance)
+        last = min(size - 1, row + max_distance)
+        for char, start, end in self._children(lo, hi, depth):
+            current = [limit] * size
+            if row <= max_distance:
+                current[0] = row
+            row_min = current[0]
+            # Last column so far in this row whose letter matches char
+            last_column = word.rfind(char, 0, first - 1) + 1
+            for j in range(first, last + 1):
+                word_char = word[j - 1]
+                if word_char == char:
+                    value = prev[j - 1]
+                    matched = j
+                else:
+                    value = prev[j - 1] + 1
+                    matched = 0
+                if prev[j] + 1 < value:
+                    value = prev[j] + 1
+                if current[j - 1] + 1 < value:
+                    value = current[j - 1] + 1
+                k = last_row.get(word_char, 0)
+                if k and last_column:
+                    swapped = rows[k - 1][last_column - 1] + (row - k - 1) + 1 + (j - last_column - 1)
+                    if swapped < value:
+                        value = swapped
+                if matched:
+                    last_column = matched
+                if value > limit:
+                    value = limit
+                current[j] = value
+                if value < row_min:
+                    row_min = value
+
+            if current[-1] <= max_distance and len(self.words[start]) == row:
+                results.append(self.words[start])
+            if row_min <= max_distance:
+                previous = last_row.get(char)
+                last_row[char] = row
+                rows.append(current)
+                self._search(word, max_distance, start, end, row, rows, last_row, results)
+                rows.pop()
+                if previous is None:
+                    del last_row[char]
+                else:
+                    last_row[char] = previous
+
+    def candidates(self, word):
+        # Known words at the smallest distance, like SpellChecker.candidates(),
+        # or None when nothing is within max_edit_distance
+        word = word.lower()
+        if word in self.frequencies:
+            return [word]
+        for max_distance in range(1, self.max_edit_distance + 1):
+            found = self.search(word, max_distance)
+            if found:
+                return sorted(found, key=self.frequencies.__getitem__, reverse=True)
+        return None
+
+    def lookup(self, word):
+        # Candidates and the chosen correction from a single search, picking the
+        # correction the same way SpellChecker.correction() does
+        candidates = self.candidates(word)
+        if not candidates:
+            return [], word
+
+        word_no_accents = remove_diacritics(word.lower())
+        same_letters = [c for c in candidates if remove_diacritics(c) == word_no_accents]
+        correction = same_letters[0] if same_letters else candidates[0]
+        return candidates, correction
@@ -0,0 +1,67 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+# Background jobs for the Qt windows.
+# Slow work (spell correction, dictionary loading) runs on QThreadPool threads
+# and its result comes back to the GUI thread through a queued signal, so the
+# click handler returns immediately. Job functions run off the GUI thread and
+# must not touch widgets.
+
+
+class TaskSignals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class Task(QRunnable):
+    def __init__(self, job_id, is_current, func, args):
+        super().__init__()
+        self.job_id = job_id
+        self.is_current = is_current
+        self.func = func
+        self.args = args
+        self.signals = TaskSignals()
+
+    def run(self):
+        # A job that was superseded while it waited in the queue never starts
+        if not self.is_current(self.job_id):
+            return
+        try:
+            result = self.func(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, str(e))
+            return
+        self.signals.finished.emit(self.job_id, result)
+
+
+class LatestJobRunner(QObject):
+    # Runs jobs in the shared thread pool and only delivers the result of the
+    # most recent one; anything submitted earlier is cancelled if it has not
+    # started yet and its result is dropped otherwise
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool.globalInstance()
+        self.latest_job = 0
+
+    def is_current(self, job_id):
+        return job_id == self.latest_job
+
+    def submit(self, func, *args):
+        self.latest_job += 1
+        task = Task(self.latest_job, self.is_current, func, args)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        self.pool.start(task)
+
+    def cancel(self):
+        self.latest_job += 1
+
+    def _on_finished(self, job_id, result):
+        if self.is_current(job_id):
+            self.finished.emit(result)
+
+    def _on_failed(self, job_id, error):
+        if self.is_current(job_id):
+            self.failed.emit(error)